@@ -0,0 +1,116 @@
+import os
+import asyncio
+import tempfile
+import utils
+import extraction
+import metrics
+
+# Clients are bound to the event loop that created them, so they are kept per loop
+_supabase_clients = {}
+_http_clients = {}
+
+async def get_supabase():
+    loop = asyncio.get_running_loop()
+    client = _supabase_clients.get(loop)
+    if client is None:
+        from supabase import acreate_client
+        client = await acreate_client(utils.SUPABASE_URL, utils.SUPABASE_KEY)
+        _supabase_clients.clear()
+        _supabase_clients[loop] = client
+    return client
+
+def get_http_client():
+    # Shared connection pool for PDF fetches and the download proxy
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None:
+        import httpx
+        client = httpx.AsyncClient(
+            timeout=extraction.DOWNLOAD_TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max(extraction.DOWNLOAD_WORKERS, 10), max_keepalive_connections=10)
+        )
+        _http_clients.clear()
+        _http_clients[loop] = client
+    return client
+
+async def fetch_table(table, columns="*", eq=None):
+    # Async twin of utils.fetch_table; both share the same table cache
+    key = (table, columns, eq)
+    rows = utils.table_cache.get(key)
+    if rows is None:
+        query = (await get_supabase()).table(table).select(columns)
+        if eq:
+            query = query.eq(*eq)
+        metrics.outbound("supabase", "select")
+        with metrics.span("supabase_select"):
+            rows = (await query.execute()).data or []
+        utils.table_cache.set(key, rows)
+    return rows
+
+@metrics.timed("load_candidates")
+async def load_candidates(include_text=True):
+    if utils.supabase_configured():
+        try:
+            rows = await fetch_table("candidates")
+            await asyncio.to_thread(utils.sync_cloud_candidates, rows)
+            return [dict(row) for row in rows]
+        except Exception as e:
+            print(f"Cloud fetch failed: {e}. Falling back to local.")
+    # The CSV/cache path is local disk and CPU work, so it runs off the event loop
+    return await asyncio.to_thread(utils.load_candidates, True, include_text)
+
+@metrics.timed("load_candidates")
+async def load_candidate_store():
+    if utils.supabase_configured():
+        try:
+            rows = await fetch_table("candidates")
+            store = utils.synced_cloud_store(rows)
+            if store is not None:
+                return store
+            await asyncio.to_thread(utils.sync_cloud_candidates, rows)
+            return await asyncio.to_thread(utils.cloud_candidate_store, rows)
+        except Exception as e:
+            print(f"Cloud fetch failed: {e}. Falling back to local.")
+    return await asyncio.to_thread(utils.load_candidate_store, True)
+
+async def get_candidate(candidate_id, columns=None):
+    if utils.supabase_configured():
+        try:
+            rows = await fetch_table("candidates", ", ".join(columns) if columns else "*", eq=("id", candidate_id))
+            return dict(rows[0]) if rows else None
+        except Exception as e:
+            print(f"Cloud lookup failed: {e}. Falling back to local.")
+    return await asyncio.to_thread(utils.get_candidate, candidate_id, columns)
+
+async def download_pdf(url):
+    # Streamed into a temp file through the shared pool; the caller removes it
+    fd, path = tempfile.mkstemp(prefix="resume-", suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            metrics.outbound("http", "pdf")
+            async with get_http_client().stream("GET", url) as response:
+                response.raise_for_status()
+                size = 0
+                async for chunk in response.aiter_bytes(extraction.CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > extraction.MAX_BYTES:
+                        raise ValueError(f"PDF larger than {extraction.MAX_BYTES} bytes")
+                    f.write(chunk)
+        return path
+    except BaseException:
+        os.remove(path)
+        raise
+
+async def get_pdf_text(filename_or_url):
+    if filename_or_url.startswith("http"):
+        try:
+            path = await download_pdf(filename_or_url)
+            try:
+                return await asyncio.to_thread(extraction.pdf_file_to_text, path)
+            finally:
+                os.remove(path)
+        except Exception as e:
+            print(f"Error fetching remote PDF {filename_or_url}: {e}")
+            return ""
+    return await asyncio.to_thread(utils.get_pdf_text, filename_or_url)
@@ -0,0 +1,98 @@
+"""Benchmark: single-pass vocabulary matcher vs. the per-pattern scans it replaced.
+
+Run from the backend directory:
+
+    python benchmarks/bench_classifier.py [--pdf-dir DIR] [--repeat N]
+
+Without --pdf-dir, resume-sized inputs (~3k, ~10k and ~30k characters) are
+synthesized from the job description dump in jd_dump.txt.
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import classifier
+
+# --- Previous implementation, kept as the reference for speed and output ---
+
+def legacy_classify_role(text):
+    text_lower = text.lower()
+    scores = {role: 0 for role in classifier.ROLES}
+    for role, keywords in classifier.ROLES.items():
+        for kw in keywords:
+            if kw in text_lower:
+                scores[role] += 1
+    if "senior" in text_lower or "lead" in text_lower or "5+ years" in text_lower:
+        scores["Senior Software Engineer"] += 2
+    if "intern" in text_lower:
+        for r in classifier.ROLES:
+            if "Intern" in r:
+                scores[r] += 1
+    best_role = max(scores, key=scores.get)
+    return "Unclassified" if scores[best_role] == 0 else best_role
+
+def legacy_extract_metadata(text):
+    text_lower = text.lower()
+    return {
+        "skills": [s for s in classifier.SKILLS if re.search(r'\b' + re.escape(s.lower()) + r'\b', text_lower)],
+        "locations": [l for l in classifier.LOCATIONS if l.lower() in text_lower],
+        "languages": [l for l in classifier.LANGUAGES if re.search(r'\b' + re.escape(l.lower()) + r'\b', text_lower)]
+    }
+
+def single_pass(text):
+    hits = classifier.scan(text)
+    return classifier.classify_role(text, hits), classifier.extract_metadata(text, hits)
+
+def legacy(text):
+    return legacy_classify_role(text), legacy_extract_metadata(text)
+
+def synthetic_inputs():
+    path = os.path.join(os.path.dirname(__file__), "..", "jd_dump.txt")
+    with open(path, encoding="utf-8") as f:
+        words = f.read().split()
+    rng = random.Random(42)
+    return {f"synthetic-{n}w": " ".join(rng.choices(words, k=n)) for n in (500, 1500, 4000)}
+
+def pdf_inputs(pdf_dir):
+    import utils
+    inputs = {}
+    for name in sorted(os.listdir(pdf_dir)):
+        if name.lower().endswith(".pdf"):
+            text = utils.get_pdf_text(os.path.join(pdf_dir, name))
+            if text:
+                inputs[name] = text
+    return inputs
+
+def timeit(fn, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pdf-dir", help="directory of real resume PDFs to benchmark on")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    inputs = pdf_inputs(args.pdf_dir) if args.pdf_dir else synthetic_inputs()
+    print(f"{'input':<32}{'chars':>8}{'legacy ms':>12}{'single ms':>12}{'speedup':>10}")
+    total_old = total_new = 0.0
+    for name, text in inputs.items():
+        assert legacy(text) == single_pass(text), f"output mismatch on {name}"
+        old = timeit(legacy, text, args.repeat)
+        new = timeit(single_pass, text, args.repeat)
+        total_old += old
+        total_new += new
+        print(f"{name[:31]:<32}{len(text):>8}{old * 1e3:>12.3f}{new * 1e3:>12.3f}{old / new:>9.1f}x")
+    if inputs:
+        print(f"{'total':<32}{'':>8}{total_old * 1e3:>12.3f}{total_new * 1e3:>12.3f}{total_old / total_new:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
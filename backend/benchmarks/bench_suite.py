@@ -0,0 +1,242 @@
+"""Offline benchmarks for the ingestion, classification and scoring hot paths.
+
+Run from the backend directory:
+
+    python benchmarks/bench_suite.py [--sizes 100,1000,10000] [--out FILE] [--compare OLD.json]
+
+Each size gets a synthetic corpus (see corpus.py, cached under --corpus-dir)
+and fresh, throwaway caches, so nothing touches Recruitment.csv, the real
+resume cache or Supabase. Results are written as JSON (by default to
+benchmarks/results/<commit>-<timestamp>.json); --compare prints the change
+against an earlier run.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND_DIR)
+os.environ["SUPABASE_URL"] = ""
+os.environ["SUPABASE_SERVICE_ROLE_KEY"] = ""
+
+import corpus
+import classifier
+import utils
+import main as api
+from csv_ingest import CsvIngestor
+from resume_cache import ResumeCache
+from keyword_index import KeywordIndex
+from score_matrix import ScoreMatrix
+from term_matrix import TermMatrix
+from candidate_store import CandidateStore
+from search_index import SearchIndex
+from fastapi.testclient import TestClient
+
+# Per-file benchmarks sample at most this many resumes
+SAMPLE = 200
+# Slowest imports reported by the startup profile
+TOP_IMPORTS = 15
+# Search box queries: a name, a skill, a phrase and a prefix
+SEARCH_QUERIES = ("Smith", "python", '"project management"', "engin*")
+
+def measure(fn, repeat=5):
+    """Wall-clock seconds of `fn()` over `repeat` runs: min/median/mean."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {"min": min(times), "median": statistics.median(times), "mean": statistics.fmean(times), "runs": repeat}
+
+def point_utils_at(corpus_dir, state_dir):
+    # Fresh caches and indexes in `state_dir`, reading candidates and PDFs from the corpus
+    utils.DATA_DIR = os.path.join(corpus_dir, "resumes")
+    utils.CSV_PATH = os.path.join(corpus_dir, "Recruitment.csv")
+    utils.csv_ingestor = CsvIngestor(utils.CSV_PATH)
+    utils.resume_cache = ResumeCache(os.path.join(state_dir, "metadata_cache.sqlite3"), max_bytes=utils.CACHE_MAX_BYTES)
+    utils.keyword_index = KeywordIndex(os.path.join(state_dir, "keyword_index.json"))
+    utils.score_matrix = ScoreMatrix(utils.keyword_index, os.path.join(state_dir, "score_matrix.npz"))
+    utils.term_matrix = TermMatrix()
+    utils.search_index = SearchIndex(os.path.join(state_dir, "search_index.sqlite3"))
+    reset_local_state()
+    api.JOBS_PATH = os.path.join(corpus_dir, "jobs.json")
+    api.FEEDBACK_FILE = os.path.join(state_dir, "interviews.json")
+    api.STATUS_PATH = os.path.join(state_dir, "status.json")
+
+def reset_local_state():
+    # What a server restart loses: in-memory candidates and the incremental CSV offset
+    utils.csv_ingestor = CsvIngestor(utils.CSV_PATH)
+    utils._local.update(candidates=CandidateStore(), sources={}, keys={}, retry_at={})
+
+def bench_size(size, corpus_root, repeat):
+    corpus_dir = corpus.generate(os.path.join(corpus_root, f"n{size}"), size)
+    state_dir = tempfile.mkdtemp(prefix="bench-state-")
+    try:
+        point_utils_at(corpus_dir, state_dir)
+        pdfs = sorted(os.listdir(utils.DATA_DIR))[:SAMPLE]
+        with open(api.JOBS_PATH) as f:
+            jobs = json.load(f)
+        results = {"candidates": size}
+
+        # 1. PDF text extraction, per file
+        timing = measure(lambda: [utils.get_pdf_text(name) for name in pdfs], repeat)
+        results["get_pdf_text"] = dict(timing, files=len(pdfs), per_file_ms=timing["median"] / len(pdfs) * 1e3)
+        texts = [utils.get_pdf_text(name) for name in pdfs]
+
+        # 2. Classifier, per resume (both calls share one vocabulary scan, as in build_metadata)
+        def classify():
+            for text in texts:
+                hits = classifier.scan(text)
+                classifier.classify_role(text, hits)
+                classifier.extract_metadata(text, hits)
+        timing = measure(classify, repeat)
+        results["classify"] = dict(timing, files=len(texts), per_file_ms=timing["median"] / len(texts) * 1e3)
+
+        # 3. load_candidates: cold (extract everything), restart (disk caches warm), warm (in memory)
+        start = time.perf_counter()
+        candidates = utils.load_candidates()
+        results["load_candidates_cold"] = {"seconds": time.perf_counter() - start}
+        def restart():
+            reset_local_state()
+            utils.load_candidates()
+        results["load_candidates_restart"] = measure(restart, repeat)
+        results["load_candidates_warm"] = measure(utils.load_candidates, repeat)
+        results["load_candidates_warm_no_text"] = measure(lambda: utils.load_candidates(include_text=False), repeat)
+
+        # 4. Legacy per-pair scoring of every resume against one JD
+        jd = jobs[0]["description"]
+        timing = measure(lambda: [utils.score_candidate(c["resume_text"], jd) for c in candidates], repeat)
+        results["score_candidate"] = dict(timing, pairs=len(candidates), per_pair_us=timing["median"] / max(len(candidates), 1) * 1e6)
+
+        # 5. The list endpoint through the ASGI app
+        client = TestClient(api.app)
+        def get_candidates(query=""):
+            response = client.get("/api/candidates" + query)
+            assert response.status_code == 200, response.text
+        results["api_candidates"] = measure(get_candidates, repeat)
+        results["api_candidates_page"] = measure(lambda: get_candidates("?limit=50&sort=-score"), repeat)
+
+        # 6. Full-text search, uncached (each query ranked from scratch) and repeated
+        def search(cached):
+            for query in SEARCH_QUERIES:
+                if not cached:
+                    utils.search_index._results.clear()
+                response = client.get("/api/search", params={"q": query})
+                assert response.status_code == 200, response.text
+        timing = measure(lambda: search(False), repeat)
+        results["api_search"] = dict(timing, queries=len(SEARCH_QUERIES), per_query_ms=timing["median"] / len(SEARCH_QUERIES) * 1e3)
+        timing = measure(lambda: search(True), repeat)
+        results["api_search_cached"] = dict(timing, queries=len(SEARCH_QUERIES), per_query_ms=timing["median"] / len(SEARCH_QUERIES) * 1e3)
+        return results
+    finally:
+        shutil.rmtree(state_dir, ignore_errors=True)
+
+def startup_profile(repeat=3):
+    """Cold-start cost in fresh interpreters: `-X importtime` of main, and import + first /api/health."""
+    env = dict(os.environ, SUPABASE_URL="", SUPABASE_SERVICE_ROLE_KEY="")
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"], cwd=BACKEND_DIR,
+                          env=env, capture_output=True, text=True)
+    imports = []
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if not line.startswith("import time:") or len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        depth = (len(parts[2]) - len(parts[2].lstrip()) - 1) // 2
+        imports.append((parts[2].strip(), depth, int(parts[0].split(":")[1]), int(parts[1])))
+    # main and what it imports directly, by cumulative time
+    direct = [(name, cumulative) for name, depth, _, cumulative in imports if depth <= 1]
+    slowest = sorted(direct, key=lambda m: -m[1])[:TOP_IMPORTS]
+
+    script = ("import time; start = time.perf_counter(); import main; "
+              "from fastapi.testclient import TestClient; "
+              "assert TestClient(main.app).get('/api/health').status_code == 200; "
+              "print(time.perf_counter() - start)")
+    times = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", script], cwd=BACKEND_DIR, env=env,
+                             capture_output=True, text=True, check=True).stdout
+        times.append(float(out.strip().splitlines()[-1]))
+    return {
+        "import_main_ms": sum(self_us for _, _, self_us, _ in imports) / 1e3,
+        "slowest_imports_ms": {name: cumulative / 1e3 for name, cumulative in slowest},
+        "first_health": {"min": min(times), "median": statistics.median(times), "mean": statistics.fmean(times), "runs": repeat}
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+def headline(entry):
+    # One comparable number per benchmark
+    if "median" in entry:
+        return entry["median"]
+    return entry.get("seconds")
+
+def compare(old, new):
+    print(f"\n{'benchmark':<36}{'size':>7}{'before':>12}{'after':>12}{'change':>9}")
+    for size, benches in new["results"].items():
+        for name, entry in benches.items():
+            before = old["results"].get(size, {}).get(name)
+            if not isinstance(entry, dict) or not isinstance(before, dict):
+                continue
+            a, b = headline(before), headline(entry)
+            if a and b:
+                print(f"{name:<36}{size:>7}{a * 1e3:>10.2f}ms{b * 1e3:>10.2f}ms{(b / a - 1) * 100:>+8.1f}%")
+    for name in ("import_main_ms", "first_health"):
+        before, after = old.get("startup", {}).get(name), new.get("startup", {}).get(name)
+        if before and after:
+            a, b = (before / 1e3, after / 1e3) if name.endswith("_ms") else (headline(before), headline(after))
+            print(f"{name:<36}{'-':>7}{a * 1e3:>10.2f}ms{b * 1e3:>10.2f}ms{(b / a - 1) * 100:>+8.1f}%")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,10000", help="comma-separated candidate counts")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--corpus-dir", default=os.path.join(tempfile.gettempdir(), "rommaana-bench-corpus"))
+    parser.add_argument("--out", help="result file (default: benchmarks/results/<commit>-<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier result file to diff against")
+    args = parser.parse_args()
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "results": {}
+    }
+    print("Profiling startup...")
+    report["startup"] = startup_profile()
+    print(f"  {'import main':<34}{report['startup']['import_main_ms']:>10.2f} ms")
+    print(f"  {'first_health':<34}{report['startup']['first_health']['median'] * 1e3:>10.2f} ms")
+    for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+        print(f"Benchmarking {size} candidates...")
+        report["results"][str(size)] = bench_size(size, args.corpus_dir, args.repeat)
+        for name, entry in report["results"][str(size)].items():
+            if isinstance(entry, dict):
+                print(f"  {name:<34}{headline(entry) * 1e3:>10.2f} ms")
+
+    out = args.out or os.path.join(os.path.dirname(__file__), "results",
+                                   f"{report['commit']}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Synthetic, reproducible candidate corpus for the offline benchmarks.
+
+Writes, under one directory:
+
+    Recruitment.csv   rows shaped like the Wix export
+    resumes/*.pdf     one generated PDF per candidate
+    jobs.json         job descriptions shaped like backend/jobs.json
+
+Run directly to (re)generate a corpus:
+
+    python benchmarks/corpus.py OUT_DIR --size 1000 [--seed 42]
+"""
+import os
+import sys
+import csv
+import json
+import random
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import classifier
+
+CSV_HEADER = ["Submission time", "First name", "Last name", "Email", "Phone", "Are you currently working?", "Attach you Resume"]
+FIRST_NAMES = ["Sara", "Omar", "Lina", "Yousef", "Maya", "Khalid", "Nour", "Adam", "Huda", "Ali", "Reem", "Faisal"]
+LAST_NAMES = ["Alharbi", "Haddad", "Nasser", "Saleh", "Khan", "Rahman", "Mansour", "Farouk", "Aziz", "Qasim"]
+LINES_PER_PAGE = 60
+
+def make_pdf(lines):
+    """Minimal text PDF (Helvetica, one text object per page) that pypdf can extract."""
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+    objs = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in pages:
+        body = " ".join("(%s) '" % l.replace("\\", "").replace("(", "").replace(")", "") for l in page)
+        content = "BT /F1 10 Tf 40 800 Td 12 TL %s ET" % body
+        objs.append("<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+        objs.append("<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Contents %d 0 R "
+                    "/Resources << /Font << /F1 3 0 R >> >> >>" % (len(objs)))
+        kids.append("%d 0 R" % len(objs))
+    objs[1] = "<< /Type /Pages /Kids [%s] /Count %d >>" % (" ".join(kids), len(kids))
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objs):
+        offsets.append(len(out))
+        out += ("%d 0 obj\n%s\nendobj\n" % (i + 1, obj)).encode("latin-1")
+    xref = len(out)
+    out += ("xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)).encode()
+    for offset in offsets:
+        out += ("%010d 00000 n \n" % offset).encode()
+    out += ("trailer << /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objs) + 1, xref)).encode()
+    return out
+
+def vocabulary():
+    # Real JD prose for filler, so token statistics resemble actual resumes
+    path = os.path.join(os.path.dirname(__file__), "..", "jd_dump.txt")
+    with open(path, encoding="utf-8") as f:
+        words = f.read().encode("ascii", "ignore").decode().split()
+    return words
+
+def resume_lines(rng, words):
+    role = rng.choice(list(classifier.ROLES))
+    lines = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", role]
+    lines.append("Skills: " + ", ".join(rng.sample(classifier.SKILLS, rng.randint(3, 10))))
+    lines.append("Location: " + rng.choice(classifier.LOCATIONS))
+    lines.append("Languages: " + ", ".join(rng.sample(classifier.LANGUAGES, rng.randint(1, 3))))
+    lines.append(" ".join(rng.sample(classifier.ROLES[role], min(4, len(classifier.ROLES[role])))))
+    for _ in range(rng.randint(25, 90)):
+        lines.append(" ".join(rng.choices(words, k=rng.randint(8, 16))))
+    return lines
+
+def job_descriptions(rng, words):
+    jobs = []
+    for i, title in enumerate(classifier.ROLES, start=1):
+        sentences = [" ".join(rng.choices(words, k=rng.randint(10, 20))) + "." for _ in range(rng.randint(12, 30))]
+        sentences.insert(rng.randint(0, len(sentences)), " ".join(classifier.ROLES[title]) + ".")
+        jobs.append({
+            "id": i,
+            "title": title,
+            "description": " ".join(sentences),
+            "skills": rng.sample(classifier.SKILLS, 5),
+            "responsibilities": [],
+            "location": rng.choice(["Riyadh", "Remote", "Europe"])
+        })
+    return jobs
+
+def generate(out_dir, size, seed=42):
+    """Write a corpus of `size` candidates to `out_dir` (skipped if already complete)."""
+    marker = os.path.join(out_dir, "corpus.json")
+    if os.path.exists(marker):
+        with open(marker) as f:
+            if json.load(f) == {"size": size, "seed": seed}:
+                return out_dir
+
+    rng = random.Random(seed)
+    words = vocabulary()
+    resume_dir = os.path.join(out_dir, "resumes")
+    os.makedirs(resume_dir, exist_ok=True)
+    with open(os.path.join(out_dir, "Recruitment.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER)
+        for i in range(size):
+            filename = f"resume_{i:05d}.pdf"
+            with open(os.path.join(resume_dir, filename), "wb") as pdf:
+                pdf.write(make_pdf(resume_lines(rng, words)))
+            writer.writerow([
+                f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T10:00:00Z",
+                rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), f"candidate{i}@example.com",
+                f"+9665{rng.randint(10000000, 99999999)}", rng.choice(["Yes", "No"]),
+                f"https://static.wixstatic.com/ugd/{filename}"
+            ])
+    with open(os.path.join(out_dir, "jobs.json"), "w") as f:
+        json.dump(job_descriptions(rng, words), f, indent=2)
+    with open(marker, "w") as f:
+        json.dump({"size": size, "seed": seed}, f)
+    return out_dir
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic benchmark corpus")
+    parser.add_argument("out_dir")
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    generate(args.out_dir, args.size, args.seed)
+    print(f"Wrote {args.size} candidates to {args.out_dir}")
@@ -0,0 +1,203 @@
+import sys
+import itertools
+import threading
+from array import array
+import classifier
+from fast_json import dumps
+
+# Column order of a local candidate, which is also the order of keys in the API response
+FIELDS = ("id", "submission_time", "first_name", "last_name", "email", "phone", "working_status",
+          "resume_url", "local_filename", "role", "skills", "locations", "languages")
+# Low-cardinality strings, stored as ids into a per-column vocabulary
+CATEGORY_FIELDS = ("role", "working_status")
+# String lists, stored as bitsets over a per-column vocabulary
+TAG_FIELDS = {"skills": classifier.SKILLS, "locations": classifier.LOCATIONS, "languages": classifier.LANGUAGES}
+# Resume text never lives in the store; callers load it from the resume cache / Supabase rows by id
+TEXT_FIELD = "resume_text"
+# Attached per request by the API, never stored
+REQUEST_FIELDS = ("feedback", "status", "score")
+
+class Vocabulary:
+    """Interned strings numbered in first-seen order."""
+    __slots__ = ("names", "ids")
+
+    def __init__(self, names=()):
+        self.names = []
+        self.ids = {}
+        for name in names:
+            self.id(name)
+
+    def id(self, name):
+        i = self.ids.get(name)
+        if i is None:
+            i = self.ids[name] = len(self.names)
+            self.names.append(sys.intern(name))
+        return i
+
+    def encode(self, names):
+        mask = 0
+        for name in names:
+            mask |= 1 << self.id(name)
+        return mask
+
+    def decode(self, mask):
+        names = []
+        while mask:
+            low = mask & -mask
+            names.append(self.names[low.bit_length() - 1])
+            mask ^= low
+        return names
+
+_serials = itertools.count(1)
+
+class CandidateStore:
+    """Columnar candidate table: one array or list per field instead of a dict per candidate.
+
+    Roles and working status are vocabulary ids, skills/locations/languages
+    are bitsets over a vocabulary seeded with the classifier's lists (so they
+    decode in the classifier's order), and resume text is kept out of line.
+    Each row's JSON is encoded once and cached until the row changes, so a
+    response is a join of cached fragments plus the per-request fields.
+    """
+
+    def __init__(self, fields=FIELDS):
+        self.fields = tuple(f for f in fields if f != TEXT_FIELD and f not in REQUEST_FIELDS)
+        self.ids = array("q")
+        self.vocab = {}
+        self.columns = {}
+        for f in self.fields:
+            if f in CATEGORY_FIELDS:
+                self.vocab[f] = Vocabulary()
+                self.columns[f] = array("i")
+            elif f in TAG_FIELDS:
+                self.vocab[f] = Vocabulary(TAG_FIELDS[f])
+                self.columns[f] = []
+            elif f != "id":
+                self.columns[f] = []
+        self._positions = {}
+        self._json = []
+        # (serial, version) changes whenever any row does, including when the store is replaced
+        self.serial = next(_serials)
+        self.version = 0
+        self._keys = {f: dumps(f) + b":" for f in self.fields}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_rows(cls, rows):
+        fields = {}
+        for row in rows:
+            fields.update(dict.fromkeys(row))
+        store = cls(fields or FIELDS)
+        for row in rows:
+            store.append(row)
+        return store
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _pack(self, field, value):
+        if field in CATEGORY_FIELDS:
+            return -1 if value is None else self.vocab[field].id(value)
+        if field in TAG_FIELDS:
+            return None if value is None else self.vocab[field].encode(value)
+        return value
+
+    def _unpack(self, field, value):
+        if field in CATEGORY_FIELDS:
+            return None if value < 0 else self.vocab[field].names[value]
+        if field in TAG_FIELDS:
+            return None if value is None else self.vocab[field].decode(value)
+        return value
+
+    def append(self, row):
+        with self._lock:
+            pos = len(self.ids)
+            for f, column in self.columns.items():
+                column.append(self._pack(f, row.get(f)))
+            self._positions[row["id"]] = pos
+            self._json.append(None)
+            self.ids.append(row["id"])
+            self.version += 1
+            return pos
+
+    def update(self, pos, **values):
+        with self._lock:
+            for f, value in values.items():
+                if f in self.columns:
+                    self.columns[f][pos] = self._pack(f, value)
+            self._json[pos] = None
+            self.version += 1
+
+    def position(self, candidate_id):
+        return self._positions.get(candidate_id)
+
+    def get(self, pos, field):
+        if pos is None:
+            return None
+        if field == "id":
+            return self.ids[pos]
+        if field not in self.columns:
+            return None
+        return self._unpack(field, self.columns[field][pos])
+
+    def row(self, pos):
+        return {f: self.get(pos, f) for f in self.fields}
+
+    def rows(self):
+        return [self.row(pos) for pos in range(len(self))]
+
+    def category_id(self, field, name):
+        # Vocabulary id to compare against columns[field], or None if no row has that value
+        vocab = self.vocab.get(field)
+        return vocab.ids.get(name) if vocab else None
+
+    def tag_masks(self, field, names):
+        # One mask per wanted name (case-insensitive); a row has them all when every mask hits
+        wanted = {n.lower() for n in names}
+        masks = dict.fromkeys(wanted, 0)
+        vocab = self.vocab.get(field) or Vocabulary()
+        for i, name in enumerate(vocab.names):
+            if name.lower() in masks:
+                masks[name.lower()] |= 1 << i
+        return list(masks.values())
+
+    def has_tags(self, pos, field, masks):
+        value = self.columns[field][pos] or 0 if field in self.columns else 0
+        return all(value & m for m in masks)
+
+    def row_json(self, pos):
+        # Stored fields of one row as a JSON object still open for the per-request fields
+        fragment = self._json[pos]
+        if fragment is None:
+            keys = self._keys
+            fragment = b"{" + b",".join(keys[f] + dumps(self.get(pos, f)) for f in self.fields)
+            self._json[pos] = fragment
+        return fragment
+
+    def to_json(self, positions, fields=None, extras=None, omit_none=()):
+        """Encode rows straight to a JSON array (bytes).
+
+        `extras` maps per-request fields (status, score, ...) to values indexed
+        by position; they follow the stored fields, and those in `omit_none`
+        are left out of a row when None. With `fields`, only those keys are
+        written, in that order.
+        """
+        extras = extras or {}
+        parts = []
+        if fields:
+            keys = [dumps(f) + b":" for f in fields]
+            for pos in positions:
+                values = (extras[f][pos] if f in extras else self.get(pos, f) for f in fields)
+                parts.append(b"{" + b",".join(k + dumps(v) for k, v in zip(keys, values)) + b"}")
+        else:
+            tail = [(b"," + dumps(name) + b":", values, name in omit_none) for name, values in extras.items()]
+            for pos in positions:
+                row = [self.row_json(pos)]
+                for key, values, optional in tail:
+                    value = values[pos]
+                    if value is None and optional:
+                        continue
+                    row.append(key + dumps(value))
+                row.append(b"}")
+                parts.append(b"".join(row))
+        return b"[" + b",".join(parts) + b"]"
@@ -0,0 +1,55 @@
+import time
+import threading
+
+class ChangeLog:
+    """Version counter for the candidate list, and the version at which each candidate last changed.
+
+    Callers pass a cheap `token` describing their inputs; while it is
+    unchanged the current version is reused without looking at any rows.
+    Otherwise they hand over a digest per candidate and only candidates
+    whose digest differs are stamped with a new version, which is what
+    `changed_since` answers delta requests from. Versions start at the
+    process start time in ms, so versions from before a restart are
+    always older than `floor` and get a full list.
+    """
+
+    def __init__(self):
+        self.version = self.floor = int(time.time() * 1000)
+        self._token = None
+        self._digests = {}
+        self._changed = {}
+        self._lock = threading.Lock()
+
+    def bump(self):
+        # For writes: the next `observe` re-checks every row even if its token looks unchanged
+        with self._lock:
+            self._token = None
+
+    def current(self, token):
+        with self._lock:
+            return self.version if self._token is not None and token == self._token else None
+
+    def observe(self, token, digests):
+        """Record {candidate id: digest} for `token`; returns the resulting version."""
+        with self._lock:
+            changed = [cid for cid, digest in digests.items() if self._digests.get(cid) != digest]
+            removed = [cid for cid in self._digests if cid not in digests]
+            if changed or removed:
+                self.version += 1
+                for cid in changed:
+                    self._changed[cid] = self.version
+                for cid in removed:
+                    self._changed.pop(cid, None)
+                if removed:
+                    # A delta cannot express removals, so older clients need the full list
+                    self.floor = self.version
+                self._digests = dict(digests)
+            self._token = token
+            return self.version
+
+    def changed_since(self, version):
+        """Ids changed after `version`, or None when only a full list is accurate."""
+        with self._lock:
+            if version < self.floor or version > self.version:
+                return None
+            return {cid for cid, v in self._changed.items() if v > version}
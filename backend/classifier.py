@@ -1,4 +1,5 @@
 import re
+import snapshot
 
 # Keyword Dictionaries
 ROLES = {
@@ -30,20 +31,89 @@ LANGUAGES = [
     "English", "Arabic", "French", "German", "Spanish", "Urdu", "Hindi"
 ]
 
-def classify_role(text):
-    text_lower = text.lower()
+def _build_trie_regex(patterns):
+    # Alternation shaped as a trie so each position costs one branch per character,
+    # wrapped in a lookahead so overlapping matches (e.g. "intern" in "internship") are all seen
+    trie = {}
+    for pattern in patterns:
+        node = trie
+        for ch in pattern:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def emit(node):
+        alts = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        return "(?:" + body + ")?" if "" in node else body
+
+    return re.compile("(?=(" + emit(trie) + "))")
+
+# Every vocabulary term, lowercased, compiled once into a single matcher
+_HEURISTIC_TERMS = ["senior", "lead", "5+ years", "intern"]
+_ALL_TERMS = sorted(
+    {kw for kws in ROLES.values() for kw in kws}
+    | {t.lower() for t in SKILLS + LOCATIONS + LANGUAGES}
+    | set(_HEURISTIC_TERMS)
+)
+_snapshot = snapshot.get("classifier", snapshot.vocabulary_key(_ALL_TERMS))
+if _snapshot:
+    _MATCHER = re.compile(_snapshot["pattern"])
+    _PREFIX_TERMS = _snapshot["prefix_terms"]
+else:
+    _MATCHER = _build_trie_regex(_ALL_TERMS)
+    # The matcher reports the longest term at each position; shorter terms that are prefixes of it matched too
+    _PREFIX_TERMS = {term: [t for t in _ALL_TERMS if term.startswith(t)] for term in _ALL_TERMS}
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+def _at_boundary(text, pos):
+    # Same rule as the regex \b anchor
+    before = pos > 0 and _is_word_char(text[pos - 1])
+    after = pos < len(text) and _is_word_char(text[pos])
+    return before != after
+
+class TermHits:
+    """Positions of every vocabulary term in one text, found in a single pass."""
+
+    def __init__(self, text):
+        self.text = text.lower()
+        self.starts = {}
+        for m in _MATCHER.finditer(self.text):
+            pos = m.start()
+            for term in _PREFIX_TERMS[m.group(1)]:
+                self.starts.setdefault(term, []).append(pos)
+
+    def contains(self, term):
+        # Plain substring semantics
+        return term in self.starts
+
+    def contains_word(self, term):
+        # Word-boundary semantics, so "java" does not match inside "javascript"
+        return any(
+            _at_boundary(self.text, pos) and _at_boundary(self.text, pos + len(term))
+            for pos in self.starts.get(term, ())
+        )
+
+def scan(text):
+    return TermHits(text)
+
+def classify_role(text, hits=None):
+    hits = hits or scan(text)
     scores = {role: 0 for role in ROLES}
     
     # Simple keyword matching
     for role, keywords in ROLES.items():
         for kw in keywords:
-            if kw in text_lower:
+            if hits.contains(kw):
                 scores[role] += 1
                 
     # Heuristics for "Senior" vs "Junior"
-    if "senior" in text_lower or "lead" in text_lower or "5+ years" in text_lower:
+    if hits.contains("senior") or hits.contains("lead") or hits.contains("5+ years"):
         scores["Senior Software Engineer"] += 2
-    if "intern" in text_lower:
+    if hits.contains("intern"):
         # Boost intern roles
         for r in ROLES:
             if "Intern" in r:
@@ -56,24 +126,13 @@ def classify_role(text):
     
     return best_role
 
-def extract_metadata(text):
-    text_lower = text.lower()
+def extract_metadata(text, hits=None):
+    hits = hits or scan(text)
     
-    found_skills = []
-    for skill in SKILLS:
-        # Check for word boundary to avoid substrings (e.g., "Java" in "JavaScript")
-        if re.search(r'\b' + re.escape(skill.lower()) + r'\b', text_lower):
-            found_skills.append(skill)
-            
-    found_locations = []
-    for loc in LOCATIONS:
-        if loc.lower() in text_lower:
-            found_locations.append(loc)
-            
-    found_languages = []
-    for lang in LANGUAGES:
-         if re.search(r'\b' + re.escape(lang.lower()) + r'\b', text_lower):
-            found_languages.append(lang)
+    # Check for word boundary to avoid substrings (e.g., "Java" in "JavaScript")
+    found_skills = [skill for skill in SKILLS if hits.contains_word(skill.lower())]
+    found_locations = [loc for loc in LOCATIONS if hits.contains(loc.lower())]
+    found_languages = [lang for lang in LANGUAGES if hits.contains_word(lang.lower())]
 
     return {
         "skills": found_skills,
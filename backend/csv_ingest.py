@@ -0,0 +1,102 @@
+import os
+import io
+import csv
+import hashlib
+import threading
+
+# Bytes fingerprinted at the start of the file and just before the last offset
+PROBE_BYTES = 4096
+
+class CsvIngestor:
+    """Incremental reader for an append-only CSV export.
+
+    Remembers the file's size, mtime and the byte offset just past the last
+    complete record, and on each `read` parses only bytes appended since.
+    The file is re-parsed from scratch only when it was rewritten: it shrank,
+    or the bytes at its head or just before the old offset changed. A last
+    row with no trailing newline is taken once it looks finished: always on a
+    rebuild, otherwise when its quotes are balanced and the file has not grown
+    since the previous poll.
+    """
+
+    def __init__(self, path, encoding="utf-8"):
+        self.path = path
+        self.encoding = encoding
+        self.rows = []
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.rows = []
+        self.fieldnames = None
+        self.offset = 0
+        self.stamp = None
+        self._head = None
+        self._tail = None
+
+    def _probe(self, f, end):
+        f.seek(0)
+        head = hashlib.sha1(f.read(min(PROBE_BYTES, end))).hexdigest()
+        f.seek(max(0, end - PROBE_BYTES))
+        tail = hashlib.sha1(f.read(min(PROBE_BYTES, end))).hexdigest()
+        return head, tail
+
+    def read(self):
+        """Return (rows, first_new_index, rebuilt).
+
+        `rows` is the full list of parsed row dicts; rows from
+        `first_new_index` on were added by this call. `rebuilt` is True when
+        the file was (re)parsed from the start.
+        """
+        with self._lock:
+            try:
+                st = os.stat(self.path)
+            except OSError:
+                rebuilt = self.stamp is not None
+                self._reset()
+                return self.rows, 0, rebuilt
+            stamp = (st.st_size, st.st_mtime_ns)
+            if stamp == self.stamp and self.offset >= st.st_size:
+                return self.rows, len(self.rows), False
+            settled = self.stamp is not None and self.stamp[0] == st.st_size
+
+            with open(self.path, "rb") as f:
+                rebuilt = False
+                if self.stamp is None or st.st_size < self.offset or self._probe(f, self.offset) != (self._head, self._tail):
+                    self._reset()
+                    rebuilt = True
+                first_new = len(self.rows)
+                f.seek(self.offset)
+                data = f.read()
+                # EOF ends the last record on a rebuild, or once an unterminated tail has stopped growing
+                at_eof = rebuilt or (settled and data.count(b'"') % 2 == 0)
+                consumed = self._parse(data, at_eof)
+                self.offset += consumed
+                self._head, self._tail = self._probe(f, self.offset)
+            self.stamp = stamp
+            return self.rows, first_new, rebuilt
+
+    def _parse(self, data, at_eof=False):
+        # Only consume complete records: up to the last newline outside quotes, or all of it at EOF
+        end = len(data) if at_eof else _last_record_end(data)
+        if end <= 0:
+            return 0
+        encoding = "utf-8-sig" if self.offset == 0 else self.encoding
+        text = data[:end].decode(encoding, errors="replace")
+        stream = io.StringIO(text, newline="")
+        if self.fieldnames is None:
+            reader = csv.DictReader(stream)
+            self.rows.extend(reader)
+            self.fieldnames = reader.fieldnames
+        else:
+            self.rows.extend(csv.DictReader(stream, fieldnames=self.fieldnames))
+        return end
+
+def _last_record_end(data):
+    # CSV escapes quotes by doubling them, so a newline ends a record iff the quotes before it are balanced
+    pos = data.rfind(b"\n")
+    while pos >= 0:
+        if data.count(b'"', 0, pos) % 2 == 0:
+            return pos + 1
+        pos = data.rfind(b"\n", 0, pos)
+    return 0
@@ -0,0 +1,133 @@
+import os
+import time
+import uuid
+import hashlib
+from fastapi import Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+import async_data
+import metrics
+import utils
+
+DOWNLOAD_CACHE_DIR = os.getenv("DOWNLOAD_CACHE_DIR", os.path.join(utils.STATE_DIR, "download_cache"))
+DOWNLOAD_CACHE_MAX_BYTES = int(os.getenv("DOWNLOAD_CACHE_MAX_MB", "512")) * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+# Upstream headers worth relaying to the browser
+PASSTHROUGH_HEADERS = ("content-length", "content-range", "accept-ranges", "etag", "last-modified")
+# Client headers forwarded upstream so ranges and revalidation work end to end
+FORWARDED_HEADERS = ("range", "if-range", "if-none-match", "if-modified-since")
+
+def cache_path(url):
+    return os.path.join(DOWNLOAD_CACHE_DIR, hashlib.sha256(url.encode()).hexdigest()[:32] + ".pdf")
+
+def file_etag(path):
+    st = os.stat(path)
+    return '"%x-%x"' % (st.st_mtime_ns, st.st_size)
+
+def not_modified(request, etag):
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+    return "*" in tags or etag in tags
+
+def content_disposition(filename):
+    return {"Content-Disposition": f"attachment; filename={filename}"}
+
+def serve_file(request: Request, path, filename):
+    # FileResponse streams with sendfile and answers Range requests itself
+    etag = file_etag(path)
+    if not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return FileResponse(path, media_type="application/pdf", headers={"ETag": etag, **content_disposition(filename)})
+
+async def proxy(request: Request, url, filename):
+    """Serve a remote resume, from the on-disk cache when possible.
+
+    Cache misses are streamed through in chunks from the shared async HTTP
+    pool, so memory stays flat regardless of PDF size. Range and conditional
+    headers are forwarded upstream; a full 200 response is teed into the
+    cache so the next download is served locally.
+    """
+    cached = cache_path(url)
+    if os.path.isfile(cached):
+        metrics.cache_event("download", True)
+        _touch(cached)
+        return serve_file(request, cached, filename)
+    metrics.cache_event("download", False)
+
+    forwarded = {h: request.headers[h] for h in FORWARDED_HEADERS if h in request.headers}
+    # Identity encoding keeps the relayed bytes consistent with the relayed Content-Length
+    forwarded["accept-encoding"] = "identity"
+    client = async_data.get_http_client()
+    metrics.outbound("http", "download")
+    upstream = await client.send(client.build_request("GET", url, headers=forwarded), stream=True)
+    if upstream.status_code >= 400:
+        await upstream.aclose()
+        upstream.raise_for_status()
+
+    headers = {h: upstream.headers[h] for h in PASSTHROUGH_HEADERS if h in upstream.headers}
+    headers.update(content_disposition(filename))
+    if upstream.status_code == 304:
+        await upstream.aclose()
+        return Response(status_code=304, headers=headers)
+
+    store = upstream.status_code == 200 and "content-range" not in upstream.headers
+    return StreamingResponse(
+        _relay(upstream, cached if store else None),
+        status_code=upstream.status_code,
+        media_type="application/pdf",
+        headers=headers
+    )
+
+def _touch(path):
+    # LRU recency lives in the atime; the mtime is what the ETag reads, so it only changes with the content
+    try:
+        os.utime(path, ns=(time.time_ns(), os.stat(path).st_mtime_ns))
+    except OSError:
+        pass
+
+async def _relay(upstream, cache_target):
+    tmp_path = None
+    tmp = None
+    complete = False
+    try:
+        if cache_target:
+            try:
+                os.makedirs(DOWNLOAD_CACHE_DIR, exist_ok=True)
+                tmp_path = f"{cache_target}.{uuid.uuid4().hex}.part"
+                tmp = open(tmp_path, "wb")
+            except OSError as e:
+                print(f"Download cache unavailable: {e}")
+        async for chunk in upstream.aiter_raw(CHUNK_SIZE):
+            if tmp:
+                tmp.write(chunk)
+            yield chunk
+        complete = True
+    finally:
+        await upstream.aclose()
+        if tmp:
+            tmp.close()
+            # Partial transfers (client went away, upstream error) are never cached
+            if complete:
+                os.replace(tmp_path, cache_target)
+                _evict()
+            else:
+                os.remove(tmp_path)
+
+def _evict():
+    try:
+        entries = [e for e in os.scandir(DOWNLOAD_CACHE_DIR) if e.name.endswith(".pdf")]
+    except OSError:
+        return
+    stats = sorted(((e.stat().st_atime, e.stat().st_size, e.path) for e in entries))
+    total = sum(size for _, size, _ in stats)
+    # Least recently served first; see _touch
+    for _, size, path in stats:
+        if total <= DOWNLOAD_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
@@ -0,0 +1,329 @@
+import os
+import mmap
+import time
+import hashlib
+import tempfile
+import threading
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+import metrics
+
+# Extraction pipeline tuning (overridable from the environment)
+DOWNLOAD_WORKERS = int(os.getenv("EXTRACT_DOWNLOAD_WORKERS", "8"))
+PARSE_WORKERS = int(os.getenv("EXTRACT_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+DOWNLOAD_TIMEOUT = float(os.getenv("EXTRACT_DOWNLOAD_TIMEOUT", "20"))
+PARSE_TIMEOUT = float(os.getenv("EXTRACT_PARSE_TIMEOUT", "30"))
+# Caps that keep one oversized portfolio PDF from stalling a worker
+MAX_BYTES = int(os.getenv("EXTRACT_MAX_MB", "25")) * 1024 * 1024
+MAX_PAGES = int(os.getenv("EXTRACT_MAX_PAGES", "30"))
+# Stop parsing once this much text is in hand; far more than classification and scoring need
+MAX_CHARS = int(os.getenv("EXTRACT_MAX_CHARS", "100000"))
+CHUNK_SIZE = 64 * 1024
+
+_session = None
+_session_lock = threading.Lock()
+_parse_pool = None
+_parse_pool_workers = None
+# One slot per pool worker; see submit_parse
+_parse_slots = None
+_parse_pool_lock = threading.Lock()
+
+def get_session():
+    # One pooled HTTP session shared by every download
+    global _session
+    with _session_lock:
+        if _session is None:
+            # Imported here so the API cold start does not pay for requests until a download happens
+            import requests
+            from requests.adapters import HTTPAdapter
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(DOWNLOAD_WORKERS, 10))
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+def download_to_file(url, timeout=DOWNLOAD_TIMEOUT, max_bytes=None):
+    """Stream a remote PDF into a temp file, hashing as it goes.
+
+    Returns (path, sha256 hex digest); the caller deletes the file. Memory
+    use stays at one chunk regardless of the PDF size.
+    """
+    max_bytes = max_bytes or MAX_BYTES
+    deadline = time.monotonic() + timeout
+    metrics.outbound("http", "pdf")
+    digest = hashlib.sha256()
+    fd, path = tempfile.mkstemp(prefix="resume-", suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as f, get_session().get(url, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            _check_length(response.headers.get("content-length"), max_bytes)
+            size = 0
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ValueError(f"PDF larger than {max_bytes} bytes")
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"download exceeded {timeout}s")
+                digest.update(chunk)
+                f.write(chunk)
+        return path, digest.hexdigest()
+    except BaseException:
+        os.remove(path)
+        raise
+
+def _check_length(header, max_bytes):
+    if header and header.isdigit() and int(header) > max_bytes:
+        raise ValueError(f"PDF larger than {max_bytes} bytes ({header})")
+
+@contextmanager
+def mapped(path, max_bytes=None):
+    """Read-only mmap of a local PDF, so parsing and hashing never copy it into memory."""
+    max_bytes = max_bytes or MAX_BYTES
+    size = os.path.getsize(path)
+    if size > max_bytes:
+        raise ValueError(f"PDF larger than {max_bytes} bytes ({size})")
+    if size == 0:
+        raise ValueError("empty PDF")
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        yield mm
+
+def iter_page_texts(stream, max_pages=None):
+    # Pages are parsed one at a time, so stopping early skips the rest of the document
+    import pypdf
+    reader = pypdf.PdfReader(stream)
+    for i, page in enumerate(reader.pages):
+        if max_pages and i >= max_pages:
+            break
+        yield (page.extract_text() or "") + "\n"
+
+def stream_to_text(stream, max_pages=None, max_chars=None):
+    """Text of a PDF stream, stopping after `max_pages` or once `max_chars` are gathered."""
+    max_pages = max_pages or MAX_PAGES
+    max_chars = max_chars or MAX_CHARS
+    parts = []
+    size = 0
+    for text in iter_page_texts(stream, max_pages):
+        parts.append(text)
+        size += len(text)
+        if size >= max_chars:
+            break
+    return "".join(parts)
+
+def pdf_file_to_text(path):
+    # Module-level so it can run inside a process pool; only the path crosses the process boundary
+    with mapped(path) as mm:
+        return stream_to_text(mm)
+
+def file_digest(path):
+    with mapped(path) as mm:
+        return hashlib.sha256(mm).hexdigest()
+
+def stage_source(source, timeout=DOWNLOAD_TIMEOUT):
+    """Make `source` available as a local file: (path, digest, is_temp)."""
+    if source.startswith("http"):
+        path, digest = download_to_file(source, timeout)
+        return path, digest, True
+    return source, file_digest(source), False
+
+def extract_source(source, timeout=DOWNLOAD_TIMEOUT, parse_timeout=PARSE_TIMEOUT):
+    """(text, sha256 digest) of one local or remote PDF, within the size/page caps."""
+    path, digest, is_temp = stage_source(source, timeout)
+    try:
+        return parse_file(path, parse_timeout), digest
+    finally:
+        if is_temp:
+            os.remove(path)
+
+def print_progress(done, total, key, error=None):
+    if error:
+        print(f"[extract] {done}/{total} {key} failed: {error}")
+    elif done == total or done % 10 == 0:
+        print(f"[extract] {done}/{total} resumes processed")
+
+def _make_parse_pool(workers):
+    if workers <= 0:
+        return ThreadPoolExecutor(max_workers=1)
+    try:
+        return ProcessPoolExecutor(max_workers=workers)
+    except (OSError, NotImplementedError) as e:
+        # Sandboxed/serverless runtimes may not allow subprocesses
+        print(f"Process pool unavailable ({e}), parsing in threads")
+        return ThreadPoolExecutor(max_workers=workers)
+
+def get_parse_pool(workers=PARSE_WORKERS):
+    # One long-lived parse pool shared by every batch, so worker start-up is paid once
+    return _pool_and_slots(workers)[0]
+
+def _pool_and_slots(workers):
+    global _parse_pool, _parse_pool_workers, _parse_slots
+    with _parse_pool_lock:
+        if _parse_pool is None or _parse_pool_workers != workers:
+            if _parse_pool is not None:
+                _parse_pool.shutdown(wait=False)
+            _parse_pool, _parse_pool_workers = _make_parse_pool(workers), workers
+            _parse_slots = threading.Semaphore(max(1, workers))
+        return _parse_pool, _parse_slots
+
+def submit_parse(path, workers=PARSE_WORKERS, block=True):
+    """Submit one parse to the shared pool once one of its workers is free.
+
+    Returns (pool, future), or None when `block` is False and every worker
+    is busy. Because the pool never has more work than workers, a parse
+    starts as soon as it is submitted, so time since submission is time
+    spent parsing and a timeout never fires on work that is only queued.
+    """
+    while True:
+        pool, slots = _pool_and_slots(workers)
+        # Bounded waits, so a pool recycled meanwhile is noticed and replaced
+        if not (slots.acquire(timeout=1.0) if block else slots.acquire(blocking=False)):
+            if block:
+                continue
+            return None
+        try:
+            future = pool.submit(pdf_file_to_text, path)
+        except (BrokenProcessPool, RuntimeError):
+            # Recycled by another caller between the lookup and the submit
+            slots.release()
+            continue
+        future.add_done_callback(lambda _: slots.release())
+        return pool, future
+
+def recycle_parse_pool(pool):
+    """Kill the worker processes of `pool` and let the next caller start a fresh one.
+
+    A running task cannot be cancelled, so this is the only way to stop a
+    hung parse. Other parses still running in the pool fail with
+    BrokenProcessPool. Thread pools (the serverless fallback) cannot be
+    interrupted and are left as they are.
+    """
+    global _parse_pool
+    if not isinstance(pool, ProcessPoolExecutor):
+        return False
+    with _parse_pool_lock:
+        if _parse_pool is pool:
+            _parse_pool = None
+    processes = list((getattr(pool, "_processes", None) or {}).values())
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.join(timeout=1)
+        if process.is_alive():
+            process.kill()
+    pool.shutdown(wait=False, cancel_futures=True)
+    return True
+
+def parse_file(path, timeout=PARSE_TIMEOUT):
+    """Text of one local PDF, parsed on the shared pool.
+
+    A parse still running after `timeout` seconds has its worker killed and
+    raises TimeoutError, so a hostile PDF cannot pin the calling thread.
+    """
+    pool, future = submit_parse(path)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeout:
+        recycle_parse_pool(pool)
+        raise TimeoutError(f"parse exceeded {timeout}s")
+
+@metrics.timed("extract_batch")
+def extract_texts(sources, on_result, download_workers=DOWNLOAD_WORKERS, parse_workers=PARSE_WORKERS,
+                  download_timeout=DOWNLOAD_TIMEOUT, parse_timeout=PARSE_TIMEOUT, progress=print_progress):
+    """Fetch and parse many PDFs concurrently.
+
+    `sources` maps a caller key to a URL or local path. Downloads run on a
+    thread pool over a shared connection pool and parsing runs on the shared
+    process pool; `on_result(key, text, digest)` is called from this thread
+    as soon as each file finishes, so callers can persist results
+    incrementally. `digest` is the SHA-256 of the PDF bytes. Failed or
+    timed-out files are reported through `progress` and skipped. Parses are
+    only handed to the pool when a worker is free (see submit_parse), so
+    `parse_timeout` measures parsing alone; a timed-out parse has its worker
+    killed (see recycle_parse_pool).
+    """
+    total = len(sources)
+    if not total:
+        return 0
+    done = 0
+    extracted = 0
+    download_pool = ThreadPoolExecutor(max_workers=max(1, download_workers))
+    pending = {}
+    started = {}
+    temp_files = {}
+    try:
+        pending.update({download_pool.submit(stage_source, src, download_timeout): ("download", key)
+                        for key, src in sources.items()})
+        digests = {}
+        paths = {}
+        # Keys already resubmitted once after their pool was killed under them
+        retried = set()
+        # Downloaded files waiting for a free parse worker
+        waiting = deque()
+        while pending or waiting:
+            while waiting:
+                submitted = submit_parse(waiting[0][1], parse_workers, block=False)
+                if submitted is None:
+                    break
+                key, _ = waiting.popleft()
+                pending[submitted[1]] = ("parse", key)
+                # The pool is kept so a timeout knows which one to recycle
+                started[submitted[1]] = (time.monotonic(), submitted[0])
+            if not pending:
+                # Every parse worker is busy with another caller's files
+                time.sleep(0.05)
+                continue
+            finished, _ = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage, key = pending.pop(future)
+                started.pop(future, None)
+                error = future.exception()
+                if error is None and stage == "download":
+                    path, digests[key], is_temp = future.result()
+                    paths[key] = path
+                    if is_temp:
+                        temp_files[key] = path
+                    waiting.append((key, path))
+                    continue
+                if isinstance(error, BrokenProcessPool) and key not in retried:
+                    # Another parse hung and its pool was killed; this file never got a fair try
+                    retried.add(key)
+                    waiting.append((key, paths[key]))
+                    continue
+                _discard_temp(temp_files, key)
+                done += 1
+                if error is None:
+                    text = future.result()
+                    if text:
+                        on_result(key, text, digests.pop(key))
+                        extracted += 1
+                progress(done, total, key, error)
+
+            # Per-file parse timeout: kill the worker stuck on it, then drop the file
+            now = time.monotonic()
+            timed_out = [f for f, (t, _) in started.items() if now - t > parse_timeout]
+            for pool in {started[f][1] for f in timed_out}:
+                recycle_parse_pool(pool)
+            for future in timed_out:
+                _, key = pending.pop(future)
+                del started[future]
+                _discard_temp(temp_files, key)
+                done += 1
+                progress(done, total, key, TimeoutError(f"parse exceeded {parse_timeout}s"))
+    finally:
+        download_pool.shutdown(wait=False, cancel_futures=True)
+        if started:
+            # Bailing out with parses still running (e.g. on_result raised): stop them before their files go
+            for pool in {pool for _, pool in started.values()}:
+                recycle_parse_pool(pool)
+        for key in list(temp_files):
+            _discard_temp(temp_files, key)
+    return extracted
+
+def _discard_temp(temp_files, key):
+    path = temp_files.pop(key, None)
+    if path:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
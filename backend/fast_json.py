@@ -0,0 +1,116 @@
+"""JSON for API responses and local files: orjson when installed, the stdlib otherwise.
+
+Responses can also be compressed with gzip, or brotli when the `brotli`
+package is installed, as negotiated through the request's Accept-Encoding.
+"""
+import os
+import json
+import gzip
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this go out uncompressed; the framing would cost more than it saves
+MIN_COMPRESS_BYTES = int(os.getenv("MIN_COMPRESS_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "5"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+
+def _default(obj):
+    # numpy scalars and arrays
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+if orjson:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(obj):
+        return orjson.dumps(obj, default=_default, option=_OPTIONS)
+
+    loads = orjson.loads
+else:
+    _encoder = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_default)
+
+    def dumps(obj):
+        return _encoder.encode(obj).encode("utf-8")
+
+    loads = json.loads
+
+def read(path, default=None):
+    try:
+        with open(path, "rb") as f:
+            return loads(f.read())
+    except (OSError, ValueError):
+        return default
+
+def write(path, data):
+    # Compact, and swapped in atomically so readers never see a partial file
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(dumps(data))
+    os.replace(tmp_path, path)
+
+def negotiate(accept_encoding):
+    """The best content coding we support for an Accept-Encoding header, or None."""
+    offered = {}
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        offered[coding] = q
+    best, best_q = None, 0.0
+    # Ties go to brotli, which compresses JSON noticeably better
+    for coding in (("br", "gzip") if brotli else ("gzip",)):
+        q = offered.get(coding, offered.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+def compress(body, accept_encoding):
+    # Returns (body, content coding or None)
+    if len(body) < MIN_COMPRESS_BYTES:
+        return body, None
+    coding = negotiate(accept_encoding)
+    if coding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY), coding
+    if coding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0), coding
+    return body, None
+
+class FastJSONResponse(Response):
+    """JSON response encoded with `dumps`.
+
+    Returned directly from an endpoint it bypasses FastAPI's
+    jsonable_encoder; `bytes` content is taken as already-encoded JSON.
+    Given the `request`, the body is compressed per its Accept-Encoding.
+    """
+    media_type = "application/json"
+
+    def __init__(self, content=None, status_code=200, headers=None, media_type=None, background=None, request=None):
+        body = self.render(content)
+        headers = dict(headers or {})
+        if request is not None:
+            body, coding = compress(body, request.headers.get("accept-encoding"))
+            headers["Vary"] = "Accept-Encoding"
+            if coding:
+                headers["Content-Encoding"] = coding
+        super().__init__(body, status_code, headers, media_type, background)
+
+    def render(self, content):
+        return content if isinstance(content, bytes) else dumps(content)
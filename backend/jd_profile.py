@@ -0,0 +1,105 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+import numpy as np
+from keyword_index import jd_keywords
+import snapshot
+
+# Ad hoc descriptions (pasted into /api/analyze, passed to score_candidate) kept compiled
+ADHOC_PROFILES = 128
+
+def job_fingerprint(description):
+    return hashlib.sha1((description or "").encode("utf-8", "ignore")).hexdigest()[:16]
+
+@lru_cache(maxsize=None)
+def score_table(n):
+    # Exactly the rounding score_candidate applies, for every possible match count
+    table = np.array([round(i / n * 100, 1) if n else 0 for i in range(n + 1)])
+    table.flags.writeable = False
+    return table
+
+def normalize_skills(skills):
+    # The jobs table's explicit skills list, trimmed and de-duplicated in order
+    seen = {}
+    for skill in skills or ():
+        skill = (skill or "").strip()
+        if skill and skill.lower() not in seen:
+            seen[skill.lower()] = skill
+    return tuple(seen.values())
+
+class JDProfile:
+    """Everything scoring needs from one job description, computed once.
+
+    `keywords` is the sorted JD keyword list (taken from the startup snapshot
+    when it has this description), `scores[n]` the percentage for n matched
+    keywords, and `skills` the job's explicit skills list.
+    """
+    __slots__ = ("job_id", "description", "skills", "fingerprint", "keywords", "keyword_set", "scores")
+
+    def __init__(self, description, skills=(), job_id=None):
+        self.job_id = job_id
+        self.description = description or ""
+        self.skills = normalize_skills(skills)
+        self.fingerprint = job_fingerprint(self.description)
+        self.keywords = tuple(snapshot.job_keywords(self.fingerprint) or sorted(jd_keywords(self.description)))
+        self.keyword_set = frozenset(self.keywords)
+        self.scores = score_table(len(self.keywords))
+
+    def percent(self, matches):
+        return float(self.scores[matches]) if self.keywords else 0
+
+class JDProfiles:
+    """Compiled profiles per job id, plus a small LRU for descriptions that are not jobs.
+
+    A job's profile is reused while its description and skills are
+    unchanged; `invalidate` drops it right away when a job is edited.
+    """
+
+    def __init__(self, max_adhoc=ADHOC_PROFILES):
+        self.max_adhoc = max_adhoc
+        self._jobs = {}
+        self._adhoc = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def for_job(self, job):
+        job_id = job.get("id")
+        description = job.get("description") or ""
+        skills = normalize_skills(job.get("skills"))
+        with self._lock:
+            profile = self._jobs.get(job_id)
+            if profile is not None and profile.description == description and profile.skills == skills:
+                self.hits += 1
+                return profile
+            self.misses += 1
+        profile = JDProfile(description, skills, job_id)
+        with self._lock:
+            self._jobs[job_id] = profile
+        return profile
+
+    def for_text(self, description):
+        description = description or ""
+        with self._lock:
+            profile = self._adhoc.get(description)
+            if profile is not None:
+                self._adhoc.move_to_end(description)
+                self.hits += 1
+                return profile
+            self.misses += 1
+        profile = JDProfile(description)
+        with self._lock:
+            self._adhoc[description] = profile
+            while len(self._adhoc) > self.max_adhoc:
+                self._adhoc.popitem(last=False)
+        return profile
+
+    def invalidate(self, job_id=None):
+        # Drop one job's profile, or every profile
+        with self._lock:
+            if job_id is None:
+                self._jobs.clear()
+                self._adhoc.clear()
+            else:
+                self._jobs.pop(job_id, None)
@@ -0,0 +1,237 @@
+import json
+import time
+import random
+import sqlite3
+import threading
+import traceback
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    candidate_id INTEGER NOT NULL,
+    payload TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    not_before REAL NOT NULL,
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    UNIQUE (kind, candidate_id)
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs(status, not_before);
+"""
+
+# Statuses: queued -> running -> done, or back to queued until attempts run out -> failed
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+class JobQueue:
+    """Persistent work queue on SQLite, one row per (kind, candidate id).
+
+    Enqueueing a job that is already queued or running is a no-op, so
+    repeated page loads never pile up duplicate work. Failed attempts are
+    retried with exponential backoff up to `max_attempts`; finished or
+    permanently failed jobs are re-armed by a later enqueue (failed ones only
+    after `retry_failed_after` seconds). Jobs left running by a crashed
+    process are requeued on start.
+    """
+
+    def __init__(self, path, max_attempts=4, backoff=5.0, retry_failed_after=300):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.retry_failed_after = retry_failed_after
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _db(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def enqueue(self, kind, candidate_id, payload=None):
+        """Queue a job; returns True if it was newly queued or re-armed."""
+        return self.enqueue_many(kind, {candidate_id: payload}) > 0
+
+    def enqueue_many(self, kind, payloads):
+        """Queue one job per {candidate_id: payload} in a single transaction.
+
+        Returns how many were newly queued or re-armed.
+        """
+        now = time.time()
+        queued = 0
+        with self._lock:
+            db = self._db()
+            for candidate_id, payload in payloads.items():
+                cur = db.execute(
+                    "INSERT INTO jobs (kind, candidate_id, payload, status, not_before, created, updated) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (kind, candidate_id) DO UPDATE SET "
+                    "payload = excluded.payload, status = excluded.status, attempts = 0, last_error = NULL, "
+                    "not_before = excluded.not_before, updated = excluded.updated "
+                    "WHERE jobs.status = ? OR (jobs.status = ? AND jobs.updated <= ?)",
+                    (kind, candidate_id, json.dumps(payload), QUEUED, now, now, now,
+                     DONE, FAILED, now - self.retry_failed_after)
+                )
+                queued += cur.rowcount
+            db.commit()
+        return queued
+
+    def claim(self):
+        """Mark the oldest ready job as running and return it, or None."""
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                "SELECT id, kind, candidate_id, payload, attempts FROM jobs "
+                "WHERE status = ? AND not_before <= ? ORDER BY not_before, id LIMIT 1", (QUEUED, now)
+            ).fetchone()
+            if not row:
+                return None
+            db.execute("UPDATE jobs SET status = ?, attempts = attempts + 1, updated = ? WHERE id = ?",
+                       (RUNNING, now, row[0]))
+            db.commit()
+        return {"id": row[0], "kind": row[1], "candidate_id": row[2],
+                "payload": json.loads(row[3]) if row[3] else None, "attempts": row[4] + 1}
+
+    def complete(self, job):
+        with self._lock:
+            db = self._db()
+            db.execute("UPDATE jobs SET status = ?, last_error = NULL, updated = ? WHERE id = ?",
+                       (DONE, time.time(), job["id"]))
+            db.commit()
+
+    def fail(self, job, error):
+        now = time.time()
+        if job["attempts"] >= self.max_attempts:
+            status, not_before = FAILED, now
+        else:
+            # Exponential backoff with jitter so a flaky host is not hammered in lockstep
+            status = QUEUED
+            not_before = now + self.backoff * 2 ** (job["attempts"] - 1) * (0.5 + random.random())
+        with self._lock:
+            db = self._db()
+            db.execute("UPDATE jobs SET status = ?, last_error = ?, not_before = ?, updated = ? WHERE id = ?",
+                       (status, str(error)[:1000], not_before, now, job["id"]))
+            db.commit()
+
+    def recover(self):
+        # Anything still marked running belongs to a worker that no longer exists
+        with self._lock:
+            db = self._db()
+            db.execute("UPDATE jobs SET status = ?, not_before = ? WHERE status = ?", (QUEUED, time.time(), RUNNING))
+            db.commit()
+
+    def get(self, kind, candidate_id):
+        with self._lock:
+            row = self._db().execute(
+                "SELECT status, attempts, last_error, updated FROM jobs WHERE kind = ? AND candidate_id = ?",
+                (kind, candidate_id)
+            ).fetchone()
+        if not row:
+            return None
+        return {"kind": kind, "candidate_id": candidate_id, "status": row[0],
+                "attempts": row[1], "error": row[2], "updated": row[3]}
+
+    def counts(self):
+        # {kind: {status: n}}
+        with self._lock:
+            rows = self._db().execute("SELECT kind, status, COUNT(*) FROM jobs GROUP BY kind, status").fetchall()
+        counts = {}
+        for kind, status, n in rows:
+            counts.setdefault(kind, {})[status] = n
+        return counts
+
+    def failures(self, limit=20):
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT kind, candidate_id, attempts, last_error, updated FROM jobs "
+                "WHERE status = ? ORDER BY updated DESC LIMIT ?", (FAILED, limit)
+            ).fetchall()
+        return [{"kind": r[0], "candidate_id": r[1], "attempts": r[2], "error": r[3], "updated": r[4]} for r in rows]
+
+class Worker:
+    """In-process worker threads draining a JobQueue.
+
+    `handlers` maps a job kind to `fn(candidate_id, payload)`; raising marks
+    the attempt as failed. `on_idle` runs once whenever the queue drains
+    after doing some work, which is where batched writes get flushed.
+    """
+
+    def __init__(self, queue, handlers, threads=2, poll_interval=1.0, on_idle=None):
+        self.queue = queue
+        self.handlers = handlers
+        self.threads = threads
+        self.poll_interval = poll_interval
+        self.on_idle = on_idle
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+        self._busy = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        return any(t.is_alive() for t in self._threads)
+
+    def start(self):
+        if self.running or self.threads <= 0:
+            return
+        self.queue.recover()
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+            for i in range(self.threads)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._wake.set()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    def notify(self):
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            job = self.queue.claim()
+            if job is None:
+                self._idle()
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+            with self._lock:
+                self._busy += 1
+            try:
+                handler = self.handlers[job["kind"]]
+                handler(job["candidate_id"], job["payload"])
+                self.queue.complete(job)
+            except Exception as e:
+                print(f"[jobs] {job['kind']} #{job['candidate_id']} attempt {job['attempts']} failed: {e}")
+                if not isinstance(e, (OSError, TimeoutError, ValueError)):
+                    traceback.print_exc()
+                self.queue.fail(job, e)
+            finally:
+                with self._lock:
+                    self._busy -= 1
+                    self._dirty = True
+
+    def _idle(self):
+        with self._lock:
+            if not self._dirty or self._busy:
+                return
+            self._dirty = False
+        if self.on_idle:
+            try:
+                self.on_idle()
+            except Exception as e:
+                print(f"[jobs] idle hook failed: {e}")
@@ -0,0 +1,214 @@
+import os
+import re
+import fast_json
+import hashlib
+import threading
+from collections import defaultdict
+import numpy as np
+
+# Filter stopwords (basic list to avoid zero-info matches)
+STOPWORDS = {"and", "the", "of", "in", "to", "a", "is", "for", "with", "on", "at", "by", "an", "be", "this", "that", "it", "are", "from", "or", "as", "if", "but", "not"}
+
+_CLEAN_RE = re.compile(r'[^a-zA-Z0-9\s]')
+
+def clean_text(text):
+    return _CLEAN_RE.sub('', text.lower())
+
+def tokenize(text):
+    return set(clean_text(text).split())
+
+def is_keyword(word):
+    return word not in STOPWORDS and len(word) > 2
+
+def jd_keywords(job_description):
+    # Unique scoring keywords of a job description
+    return {w for w in clean_text(job_description).split() if is_keyword(w)}
+
+def fingerprint(text):
+    return hashlib.sha1(text.encode("utf-8", "ignore")).hexdigest()[:16]
+
+class KeywordIndex:
+    """Inverted index (keyword -> candidate ids) over resume text.
+
+    Only tokens that can ever be a JD keyword are indexed, so scoring a job
+    description is a lookup per JD keyword instead of a re-tokenization of
+    every resume. The index is persisted to disk and kept current by `sync`,
+    which only re-tokenizes resumes whose text fingerprint changed.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.docs = {}
+        self.postings = defaultdict(set)
+        # candidate id -> its indexed tokens, so removing a resume only touches its own postings
+        self.doc_tokens = {}
+        self._loaded = False
+        self._dirty = False
+        self._lock = threading.RLock()
+        # Dense row view of the postings, rebuilt lazily after any mutation
+        self._doc_ids = None
+        self._rows = None
+        self._vectors = {}
+        # Bumped on every mutation so derived structures can tell they are stale
+        self.version = 0
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "rb") as f:
+                data = fast_json.loads(f.read())
+            self.docs = {int(cid): fp for cid, fp in data.get("docs", {}).items()}
+            for token, cids in data.get("postings", {}).items():
+                self.postings[token] = set(cids)
+                for cid in cids:
+                    self.doc_tokens.setdefault(cid, set()).add(token)
+        except Exception as e:
+            print(f"Keyword index unreadable, rebuilding: {e}")
+            self.docs = {}
+            self.postings = defaultdict(set)
+            self.doc_tokens = {}
+
+    def save(self):
+        with self._lock:
+            if not self.path or not self._dirty:
+                return
+            data = {
+                "docs": {str(cid): fp for cid, fp in self.docs.items()},
+                "postings": {token: sorted(cids) for token, cids in self.postings.items() if cids}
+            }
+            try:
+                fast_json.write(self.path, data)
+                self._dirty = False
+            except Exception as e:
+                print(f"Failed to persist keyword index: {e}")
+
+    def _invalidate(self):
+        self.version += 1
+        self._doc_ids = None
+        self._rows = None
+        self._vectors = {}
+
+    def _discard(self, cid):
+        if cid not in self.docs:
+            return
+        self._invalidate()
+        del self.docs[cid]
+        for token in self.doc_tokens.pop(cid, ()):
+            cids = self.postings.get(token)
+            if cids is not None:
+                cids.discard(cid)
+                if not cids:
+                    del self.postings[token]
+
+    def add(self, cid, text, fp=None):
+        with self._lock:
+            self._ensure_loaded()
+            fp = fp or fingerprint(text)
+            if self.docs.get(cid) == fp:
+                return False
+            self._discard(cid)
+            self._invalidate()
+            tokens = {token for token in tokenize(text) if is_keyword(token)}
+            for token in tokens:
+                self.postings[token].add(cid)
+            self.doc_tokens[cid] = tokens
+            self.docs[cid] = fp
+            self._dirty = True
+            return True
+
+    def remove(self, cid):
+        with self._lock:
+            self._ensure_loaded()
+            if cid in self.docs:
+                self._discard(cid)
+                self._dirty = True
+
+    def sync(self, candidates, fingerprints=None, load_text=None, defer=None):
+        """Index new/changed resumes and drop candidates that disappeared.
+
+        By default the fingerprint is a hash of each candidate's resume_text.
+        Callers that already know a content key per candidate can pass
+        `fingerprints` ({id: key}) and `load_text(id)`, so unchanged resumes
+        are skipped without their text ever being loaded. With `defer`, the
+        ids of new/changed resumes are handed to `defer(ids)` instead of being
+        tokenized here, so the caller can index them in the background.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            seen = set()
+            deferred = []
+            for c in candidates:
+                cid = c["id"]
+                text = c.get("resume_text")
+                if fingerprints is not None:
+                    fp = fingerprints.get(cid)
+                else:
+                    fp = fingerprint(text) if text else None
+                if not fp:
+                    continue
+                seen.add(cid)
+                if self.docs.get(cid) == fp:
+                    continue
+                if defer:
+                    deferred.append(cid)
+                    continue
+                text = text or (load_text(cid) if load_text else None)
+                if text:
+                    self.add(cid, text, fp)
+            for cid in [cid for cid in self.docs if cid not in seen]:
+                self.remove(cid)
+            self.save()
+        if deferred:
+            defer(deferred)
+
+    def __contains__(self, cid):
+        with self._lock:
+            self._ensure_loaded()
+            return cid in self.docs
+
+    def _vector(self, token):
+        vec = self._vectors.get(token)
+        if vec is None:
+            cids = self.postings.get(token, ())
+            vec = np.fromiter((self._rows[cid] for cid in cids), dtype=np.int32, count=len(cids))
+            self._vectors[token] = vec
+        return vec
+
+    def _dense(self):
+        if self._doc_ids is None:
+            self._doc_ids = np.array(sorted(self.docs), dtype=np.int64)
+            self._rows = {cid: row for row, cid in enumerate(self._doc_ids.tolist())}
+
+    def fingerprints(self):
+        # (version, {candidate id: fingerprint}) snapshot
+        with self._lock:
+            self._ensure_loaded()
+            return self.version, dict(self.docs)
+
+    def hit_rows(self, keywords):
+        """Returns (doc_ids, [rows of doc_ids whose resume has keyword k, per keyword])."""
+        with self._lock:
+            self._ensure_loaded()
+            self._dense()
+            return self._doc_ids, [self._vector(kw) for kw in keywords]
+
+    def count_vector(self, keywords):
+        """Vectorized match counts for every indexed candidate.
+
+        Returns (doc_ids, counts) where counts[i] is the number of `keywords`
+        found in the resume of candidate doc_ids[i].
+        """
+        with self._lock:
+            self._ensure_loaded()
+            self._dense()
+            vectors = [self._vector(kw) for kw in keywords]
+            hits = np.concatenate(vectors) if vectors else np.empty(0, dtype=np.int32)
+            return self._doc_ids, np.bincount(hits, minlength=len(self._doc_ids))
+
+    def matched(self, cid, keywords):
+        with self._lock:
+            return [kw for kw in keywords if cid in self.postings.get(kw, ())]
@@ -1,15 +1,33 @@
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import FileResponse, StreamingResponse, RedirectResponse, JSONResponse
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import RedirectResponse, JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional
 import utils
-import json
+import async_data
+import downloads
+import metrics
+import fast_json
+from fast_json import FastJSONResponse
+import time
+import asyncio
+import hashlib
+from term_matrix import SCORING_MODES
+import numpy as np
 import os
-import io
+import sqlite3
 import traceback
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Resume extraction and indexing run on background workers while the API serves
+    utils.worker.start()
+    yield
+    utils.worker.stop()
+
+app = FastAPI(lifespan=lifespan)
 
 # Global Exception Handler for Debugging
 @app.exception_handler(Exception)
@@ -34,8 +52,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "X-Next-Offset", "Server-Timing", "ETag", "X-Version", "X-Delta"],
 )
 
+@app.middleware("http")
+async def instrument_requests(request: Request, call_next):
+    # Per-request stage timings go out as Server-Timing; latency feeds /api/metrics
+    spans = {}
+    token = metrics.request_spans.set(spans)
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        metrics.request_spans.reset(token)
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        metrics.observe("rommaana_http_request_seconds", time.perf_counter() - start,
+                        method=request.method, route=route, status=str(status))
+    response.headers["Server-Timing"] = metrics.server_timing(spans, time.perf_counter() - start)
+    return response
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 FEEDBACK_FILE = os.path.join(BASE_DIR, "interviews.json")
 JOBS_PATH = os.path.join(BASE_DIR, "jobs.json")
@@ -44,37 +81,33 @@ STATUS_PATH = os.path.join(BASE_DIR, "status.json")
 # --- Data Loading Helpers ---
 
 def load_json(path, default=[]):
-    if not os.path.exists(path): return default
-    with open(path, "r") as f:
-        try: return json.load(f)
-        except: return default
+    return fast_json.read(path, default)
 
 def save_json(path, data):
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+    fast_json.write(path, data)
 
-def load_feedback():
-    if utils.supabase:
+async def load_feedback():
+    if utils.supabase_configured():
         try:
-            res = utils.supabase.table("interviews_feedback").select("*").execute()
-            data = res.data or []
+            data = await async_data.fetch_table("interviews_feedback")
             return {str(item["candidate_id"]): item for item in data}
         except: pass
     return load_json(FEEDBACK_FILE, default={})
 
-def load_jobs():
-    if utils.supabase:
+async def load_jobs():
+    if utils.supabase_configured():
         try:
-            res = utils.supabase.table("jobs").select("*").execute()
-            return res.data or []
+            return [dict(job) for job in await async_data.fetch_table("jobs")]
         except: pass
     return load_json(JOBS_PATH, default=[])
 
-def load_status():
-    if utils.supabase:
+def now_iso():
+    return datetime.now(timezone.utc).isoformat()
+
+async def load_status():
+    if utils.supabase_configured():
         try:
-            res = utils.supabase.table("candidate_status").select("*").execute()
-            data = res.data or []
+            data = await async_data.fetch_table("candidate_status")
             return {str(item["candidate_id"]): item["status"] for item in data}
         except: pass
     return load_json(STATUS_PATH, default={})
@@ -83,6 +116,12 @@ def load_status():
 
 class JobDescriptionRequest(BaseModel):
     description: str
+    top_k: int = 20
+    offset: int = 0
+    role: Optional[str] = None
+    skills: Optional[List[str]] = []
+    # "percent" (share of JD keywords found), "bm25" or "tfidf"
+    scoring: str = "percent"
 
 class FeedbackRequest(BaseModel):
     candidate_id: int
@@ -98,118 +137,422 @@ class StatusUpdate(BaseModel):
 
 # --- Endpoints ---
 
-@app.get("/api/candidates")
-def get_candidates():
-    candidates = utils.load_candidates()
-    feedback_data = load_feedback()
-    status_data = load_status()
-    jobs = load_jobs()
-    job_map = {job["title"]: job["description"] for job in jobs}
-    
-    for c in candidates:
-        cid = str(c["id"])
-        c["feedback"] = feedback_data.get(cid)
-        c["status"] = status_data.get(cid, "Received")
-        role = c.get("role")
-        if role in job_map and not c.get("score"):
-            jd_text = job_map[role]
-            resume_text = c.get("resume_text", "")
-            if resume_text:
-                score, matches = utils.score_candidate(resume_text, jd_text)
-                c["score"] = score
-    return candidates
-
-@app.get("/api/jobs")
-def get_jobs():
-    return load_jobs()
+# Sortable columns for the candidate list; missing values sort last
+SORT_FIELDS = {"id", "score", "submission_time", "first_name", "last_name", "role", "status"}
+
+def split_param(value):
+    return [v.strip() for v in value.split(",") if v.strip()] if value else []
+
+def list_etag(version, query):
+    # Weak: the same list may go out gzip'd, brotli'd or plain
+    return 'W/"%d-%s"' % (version, hashlib.blake2b(query.encode(), digest_size=6).hexdigest())
+
+def etag_matches(request, etag):
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in tags)
+
+def not_modified(etag, version):
+    return Response(status_code=304, headers={"ETag": etag, "X-Version": str(version), "Cache-Control": "no-cache"})
+
+@app.get("/api/candidates", response_class=FastJSONResponse)
+async def get_candidates(
+    request: Request,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    fields: Optional[str] = None,
+    sort: Optional[str] = None,
+    status: Optional[str] = None,
+    role: Optional[str] = None,
+    min_score: Optional[float] = None,
+    skills: Optional[str] = None,
+    since: Optional[int] = None
+):
+    # resume_text is only included when explicitly requested via ?fields=
+    field_list = split_param(fields)
+    # Independent reads run concurrently instead of back to back
+    store, feedback_data, status_data, jobs = await asyncio.gather(
+        async_data.load_candidate_store(),
+        load_feedback(),
+        load_status(),
+        load_jobs()
+    )
+    # Everything the list depends on, cheaply; while it is unchanged an idle poll is answered right here
+    token = (
+        store.serial, store.version, utils.keyword_index.version,
+        hash(fast_json.dumps(feedback_data)), hash(fast_json.dumps(status_data)), hash(fast_json.dumps(jobs))
+    )
+    version = utils.changes.current(token)
+    if version is not None and etag_matches(request, list_etag(version, request.url.query)):
+        return not_modified(list_etag(version, request.url.query), version)
+
+    # Scores come from the precomputed matrix; only resumes/jobs changed since the last call are recomputed
+    with metrics.span("score_matrix"):
+        await asyncio.to_thread(utils.score_matrix.refresh, jobs)
+
+    # Per-request columns, indexed by store position like the stored ones
+    n = len(store)
+    ids = store.ids[:n]
+    feedback_col = [feedback_data.get(str(cid)) for cid in ids]
+    status_col = [status_data.get(str(cid), "Received") for cid in ids]
+    score_col = [None] * n
+    role_col = store.columns.get("role")
+    if role_col is not None:
+        role_jobs = {store.category_id("role", job["title"]): job["id"] for job in jobs if job.get("id") is not None}
+        for pos in range(n):
+            job_id = role_jobs.get(role_col[pos])
+            if job_id is not None:
+                scored = utils.score_matrix.score(ids[pos], job_id)
+                if scored:
+                    score_col[pos] = scored[0]
+
+    if version is None:
+        # Inputs moved: re-diff every row so only candidates that really changed get the new version
+        _, text_fps = utils.keyword_index.fingerprints()
+        digests = {
+            cid: hash((store.row_json(p), status_col[p], score_col[p], fast_json.dumps(feedback_col[p]), text_fps.get(cid)))
+            for p, cid in enumerate(ids)
+        }
+        version = utils.changes.observe(token, digests)
+    etag = list_etag(version, request.url.query)
+    if etag_matches(request, etag):
+        return not_modified(etag, version)
+    headers = {"ETag": etag, "X-Version": str(version), "Cache-Control": "no-cache"}
+
+    # Server-side filters
+    positions = range(n)
+    statuses = set(split_param(status))
+    roles = set(split_param(role))
+    wanted_skills = split_param(skills)
+    if statuses:
+        positions = [p for p in positions if status_col[p] in statuses]
+    if roles:
+        wanted_roles = {store.category_id("role", r) for r in roles} - {None}
+        positions = [p for p in positions if role_col is not None and role_col[p] in wanted_roles]
+    if min_score is not None:
+        positions = [p for p in positions if (score_col[p] or 0) >= min_score]
+    if wanted_skills:
+        masks = store.tag_masks("skills", wanted_skills)
+        positions = [p for p in positions if store.has_tags(p, "skills", masks)]
+    if since is not None:
+        # Delta sync: only candidates whose record, status, feedback or score changed after `since`.
+        # Older or unknown versions (e.g. from before a restart) get the full list.
+        changed = utils.changes.changed_since(since)
+        headers["X-Delta"] = "full" if changed is None else "changes"
+        if changed is not None:
+            positions = [p for p in positions if ids[p] in changed]
+
+    extras = {"feedback": feedback_col, "status": status_col, "score": score_col}
+    if sort:
+        key = sort.lstrip("-")
+        if key not in SORT_FIELDS:
+            raise HTTPException(status_code=400, detail=f"Unsupported sort field: {key}")
+        values = extras[key] if key in extras else [store.get(p, key) for p in range(n)]
+        present = [p for p in positions if values[p] is not None]
+        missing = [p for p in positions if values[p] is None]
+        positions = sorted(present, key=values.__getitem__, reverse=sort.startswith("-")) + missing
+
+    # Offset pagination; totals travel in headers so the body stays a plain list
+    total = len(positions)
+    offset = max(0, offset)
+    if limit is not None:
+        limit = max(0, limit)
+    page = positions[offset:offset + limit] if limit is not None else positions[offset:]
+    headers["X-Total-Count"] = str(total)
+    if offset + len(page) < total:
+        headers["X-Next-Offset"] = str(offset + len(page))
+
+    if "resume_text" in field_list:
+        texts = await asyncio.to_thread(utils.load_resume_texts, [ids[p] for p in page])
+        extras["resume_text"] = {p: texts.get(ids[p]) or "" for p in page}
+    # Encoded straight from the store's columns and cached row fragments
+    with metrics.span("serialize"):
+        body = store.to_json(page, field_list, extras, omit_none=("score",))
+    return FastJSONResponse(body, headers=headers, request=request)
+
+@app.post("/api/analyze", response_class=FastJSONResponse)
+async def analyze_job_description(request: JobDescriptionRequest, http_request: Request):
+    if request.scoring not in SCORING_MODES:
+        raise HTTPException(status_code=400, detail=f"Unsupported scoring mode: {request.scoring}")
+    profile = utils.jd_profiles.for_text(request.description)
+    keywords = list(profile.keywords)
+    top_k = max(0, min(request.top_k, 200))
+    offset = max(0, request.offset)
+    if not keywords or not top_k:
+        return {"total": 0, "offset": offset, "top_k": top_k, "keywords": keywords, "scoring": request.scoring, "results": []}
+
+    store = await async_data.load_candidate_store()
+    with metrics.span("count_vector"):
+        doc_ids, counts = utils.keyword_index.count_vector(keywords)
+    ranking = counts
+    if request.scoring != "percent":
+        with metrics.span("term_matrix"):
+            await asyncio.to_thread(utils.refresh_term_matrix)
+            term_ids, weights = utils.term_matrix.score(keywords, request.scoring)
+        # Align the weighted scores with the keyword index rows (both sorted by id)
+        pos = np.searchsorted(doc_ids, term_ids)
+        found = pos < len(doc_ids)
+        found[found] = doc_ids[pos[found]] == term_ids[found]
+        ranking = np.zeros(len(doc_ids))
+        ranking[pos[found]] = weights[found]
+
+    masks = store.tag_masks("skills", request.skills) if request.skills else None
+    def eligible(cid):
+        pos = store.position(cid)
+        if pos is None:
+            return False
+        if request.role and store.get(pos, "role") != request.role:
+            return False
+        if masks and not store.has_tags(pos, "skills", masks):
+            return False
+        return True
+
+    if request.role or masks or len(store) != len(doc_ids):
+        mask = np.fromiter((eligible(cid) for cid in doc_ids.tolist()), dtype=bool, count=len(doc_ids))
+        counts = np.where(mask, counts, 0)
+        ranking = np.where(mask, ranking, 0)
+
+    hits = np.flatnonzero(counts)
+    # Partial sort: only the top offset+top_k rows are ever ordered
+    k = min(offset + top_k, len(hits))
+    if k < len(hits):
+        hits = hits[np.argpartition(-ranking[hits], k - 1)[:k]]
+    order = np.lexsort((doc_ids[hits], -ranking[hits]))
+
+    results = []
+    for row in hits[order][offset:].tolist():
+        cid = int(doc_ids[row])
+        pos = store.position(cid)
+        percent = profile.percent(int(counts[row]))
+        result = {
+            "id": cid,
+            "first_name": store.get(pos, "first_name") or "",
+            "last_name": store.get(pos, "last_name") or "",
+            "role": store.get(pos, "role"),
+            "score": percent if request.scoring == "percent" else round(float(ranking[row]), 4),
+            "matches": utils.keyword_index.matched(cid, keywords)
+        }
+        if request.scoring != "percent":
+            result["percent"] = percent
+        results.append(result)
+    return FastJSONResponse({
+        "total": int(np.count_nonzero(counts)), "offset": offset, "top_k": top_k,
+        "keywords": keywords, "scoring": request.scoring, "results": results
+    }, request=http_request)
+
+@app.get("/api/search", response_class=FastJSONResponse)
+async def search_candidates(request: Request, q: str, offset: int = 0, limit: int = 20):
+    """Full-text search over names, skills, locations and resume text.
+
+    Supports "quoted phrases", prefix* matches and OR; results are ranked by
+    BM25 and carry an HTML-escaped snippet with the hits wrapped in <mark>.
+    """
+    # Loading the candidates runs the ingestion sync that keeps the index current
+    store = await async_data.load_candidate_store()
+    offset = max(0, offset)
+    limit = max(0, min(limit, 100))
+    try:
+        with metrics.span("search"):
+            total, hits = await asyncio.to_thread(utils.search_index.search, q, offset, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except sqlite3.Error as e:
+        print(f"Search failed: {e}")
+        raise HTTPException(status_code=503, detail="Search index unavailable")
+
+    results = []
+    for cid, score, snippet in hits:
+        pos = store.position(cid)
+        results.append({
+            "id": cid,
+            "first_name": store.get(pos, "first_name") or "",
+            "last_name": store.get(pos, "last_name") or "",
+            "role": store.get(pos, "role"),
+            "score": score,
+            "snippet": snippet
+        })
+    headers = {"X-Total-Count": str(total)}
+    if offset + len(results) < total:
+        headers["X-Next-Offset"] = str(offset + len(results))
+    return FastJSONResponse(results, headers=headers, request=request)
+
+@app.get("/api/jobs", response_class=FastJSONResponse)
+async def get_jobs(request: Request):
+    return FastJSONResponse(await load_jobs(), request=request)
+
+@app.get("/api/jobs/{job_id}/ranking", response_class=FastJSONResponse)
+async def rank_candidates_for_job(job_id: int, request: Request, offset: int = 0, limit: int = 20):
+    store, jobs = await asyncio.gather(async_data.load_candidate_store(), load_jobs())
+    if not any(job.get("id") == job_id for job in jobs):
+        raise HTTPException(status_code=404, detail="Job not found")
+    await asyncio.to_thread(utils.score_matrix.refresh, jobs)
+    doc_ids, scores = utils.score_matrix.job_scores(job_id)
+
+    hits = np.flatnonzero(scores)
+    offset = max(0, offset)
+    limit = max(0, min(limit, 200))
+    k = min(offset + limit, len(hits))
+    if k and k < len(hits):
+        hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+    order = np.lexsort((doc_ids[hits], -scores[hits]))
+
+    results = []
+    for row in hits[order][offset:offset + limit].tolist():
+        cid = int(doc_ids[row])
+        pos = store.position(cid)
+        results.append({
+            "id": cid,
+            "first_name": store.get(pos, "first_name") or "",
+            "last_name": store.get(pos, "last_name") or "",
+            "role": store.get(pos, "role"),
+            "score": float(scores[row]),
+            "matches": utils.score_matrix.matches(cid, job_id)
+        })
+    return FastJSONResponse(results, headers={"X-Total-Count": str(len(np.flatnonzero(scores)))}, request=request)
 
 @app.put("/api/jobs/{job_id}")
-def update_job(job_id: int, job_update: JobUpdate):
-    if utils.supabase:
+async def update_job(job_id: int, job_update: JobUpdate):
+    if utils.supabase_configured():
         try:
-            utils.supabase.table("jobs").upsert({
+            row = {
                 "id": job_id,
                 "description": job_update.description,
                 "skills": job_update.skills
-            }).execute()
+            }
+            metrics.outbound("supabase", "upsert")
+            await (await async_data.get_supabase()).table("jobs").upsert(row).execute()
+            utils.patch_cached_rows("jobs", "id", row)
+            utils.jd_profiles.invalidate(job_id)
+            await asyncio.to_thread(utils.score_matrix.set_job, row)
+            utils.changes.bump()
             return {"status": "success"}
         except: pass
     return {"status": "error", "message": "Supabase sync failed"}
 
 @app.put("/api/candidates/{candidate_id}/status")
-def update_candidate_status(candidate_id: int, status_update: StatusUpdate):
-    if utils.supabase:
+async def update_candidate_status(candidate_id: int, status_update: StatusUpdate):
+    if utils.supabase_configured():
         try:
-            utils.supabase.table("candidate_status").upsert({
+            metrics.outbound("supabase", "upsert")
+            await (await async_data.get_supabase()).table("candidate_status").upsert({
                 "candidate_id": candidate_id,
                 "status": status_update.status,
                 "updated_at": "now()"
             }).execute()
+            utils.patch_cached_rows("candidate_status", "candidate_id", {
+                "candidate_id": candidate_id,
+                "status": status_update.status,
+                "updated_at": now_iso()
+            })
+            utils.changes.bump()
             return {"status": "success"}
         except: pass
     return {"status": "error"}
 
-@app.get("/api/candidates/{candidate_id}/resume")
-def get_candidate_resume_text(candidate_id: int):
-    candidates = utils.load_candidates()
-    target = next((c for c in candidates if c.get("id") == candidate_id), None)
+@app.get("/api/candidates/{candidate_id}/resume", response_class=FastJSONResponse)
+async def get_candidate_resume_text(candidate_id: int, request: Request):
+    target = await async_data.get_candidate(candidate_id, ["id", "role", "resume_url", "resume_text"])
     if not target:
         raise HTTPException(status_code=404, detail="Candidate not found")
 
     if target.get("resume_text"):
-        return {"text": target["resume_text"]}
+        return FastJSONResponse({"text": target["resume_text"]}, request=request)
+
+    if target.get("resume_url") and utils.worker.running:
+        # Never download inside the request; the worker backfills it and a later call gets the text
+        job = await asyncio.to_thread(utils.request_extraction, target)
+        return JSONResponse(status_code=202, content={"text": "", "job": job})
 
     if target.get("resume_url"):
-        text = utils.get_pdf_text(target["resume_url"])
+        text = await async_data.get_pdf_text(target["resume_url"])
         if text:
-            if utils.supabase:
-                try: utils.supabase.table("candidates").update({"resume_text": text}).eq("id", candidate_id).execute()
+            if utils.supabase_configured():
+                try:
+                    metrics.outbound("supabase", "update")
+                    await (await async_data.get_supabase()).table("candidates").update({"resume_text": text}).eq("id", candidate_id).execute()
+                    utils.patch_cached_rows("candidates", "id", {"id": candidate_id, "resume_text": text}, insert=False)
                 except: pass
+            await asyncio.to_thread(utils.index_resume_text, candidate_id, text)
             return {"text": text}
 
     raise HTTPException(status_code=404, detail="Resume text unavailable")
 
+@app.get("/api/candidates/{candidate_id}/scores")
+async def get_candidate_scores(candidate_id: int):
+    # How one candidate scores against every open role, best first
+    jobs = await load_jobs()
+    await asyncio.to_thread(utils.score_matrix.refresh, jobs)
+    scores = utils.score_matrix.candidate_scores(candidate_id)
+    results = [
+        {"job_id": job["id"], "title": job.get("title"), "score": scores[job["id"]][0], "matches": scores[job["id"]][1]}
+        for job in jobs if job.get("id") in scores
+    ]
+    return sorted(results, key=lambda r: -r["score"])
+
 @app.get("/api/candidates/{candidate_id}/download")
-def download_candidate_resume(candidate_id: int):
-    candidates = utils.load_candidates()
-    target = next((c for c in candidates if c.get("id") == candidate_id), None)
+async def download_candidate_resume(candidate_id: int, request: Request):
+    target = await async_data.get_candidate(candidate_id, ["id", "resume_url", "local_filename"])
     if not target:
         raise HTTPException(status_code=404, detail="Candidate not found")
 
+    filename = target.get("local_filename") or "resume.pdf"
+    local_path = utils.resolve_pdf_path(target["local_filename"]) if target.get("local_filename") else None
+    if local_path:
+        return downloads.serve_file(request, local_path, filename)
+
     if target.get("resume_url"):
         try:
-            import requests
-            resp = requests.get(target["resume_url"], timeout=10)
-            resp.raise_for_status()
-            return StreamingResponse(
-                io.BytesIO(resp.content),
-                media_type="application/pdf",
-                headers={"Content-Disposition": f"attachment; filename={target.get('local_filename', 'resume.pdf')}"}
-            )
+            return await downloads.proxy(request, target["resume_url"], filename)
         except:
             return RedirectResponse(target["resume_url"])
 
     raise HTTPException(status_code=404, detail="File not found")
 
 @app.post("/api/feedback")
-def submit_feedback(request: FeedbackRequest):
-    if utils.supabase:
+async def submit_feedback(request: FeedbackRequest):
+    if utils.supabase_configured():
         try:
-            utils.supabase.table("interviews_feedback").upsert({
+            metrics.outbound("supabase", "upsert")
+            await (await async_data.get_supabase()).table("interviews_feedback").upsert({
                 "candidate_id": request.candidate_id,
                 "rating": request.rating,
                 "notes": request.notes,
                 "updated_at": "now()"
             }).execute()
+            utils.patch_cached_rows("interviews_feedback", "candidate_id", {
+                "candidate_id": request.candidate_id,
+                "rating": request.rating,
+                "notes": request.notes,
+                "updated_at": now_iso()
+            })
+            utils.changes.bump()
             return {"status": "success"}
         except: pass
     return {"status": "error"}
 
+@app.get("/api/queue")
+def queue_status():
+    return {
+        "workers": utils.JOB_WORKERS if utils.worker.running else 0,
+        "jobs": utils.jobs.counts(),
+        "failures": utils.jobs.failures()
+    }
+
+@app.get("/api/queue/{candidate_id}")
+def candidate_queue_status(candidate_id: int):
+    return {kind: utils.jobs.get(kind, candidate_id) for kind in ("extract", "score")}
+
+@app.get("/api/metrics")
+def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/api/health")
 def health_check():
     return {
         "status": "online",
-        "supabase_connected": utils.supabase is not None,
+        "supabase_connected": utils.supabase_configured(),
         "env_check": {
             "url_set": os.getenv("SUPABASE_URL") is not None,
             "key_set": os.getenv("SUPABASE_SERVICE_ROLE_KEY") is not None
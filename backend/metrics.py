@@ -0,0 +1,155 @@
+import time
+import inspect
+import functools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Histogram buckets in seconds, from sub-millisecond cache reads to multi-second cold extraction
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+FAMILIES = {
+    "rommaana_http_request_seconds": ("histogram", "API request latency by route."),
+    "rommaana_stage_seconds": ("histogram", "Latency of instrumented hot-path stages."),
+    "rommaana_outbound_requests_total": ("counter", "Calls made to Supabase and remote resume hosts."),
+    "rommaana_cache_requests_total": ("counter", "Cache lookups by cache and result."),
+    "rommaana_cache_hit_ratio": ("gauge", "Share of cache lookups that hit."),
+    "rommaana_jobs": ("gauge", "Background jobs by kind and status."),
+}
+
+_lock = threading.Lock()
+# (name, labels) -> [per-bucket counts, sum, count]
+_histograms = {}
+# (name, labels) -> value
+_counters = {}
+# Callables returning [(name, labels dict, value)], sampled at scrape time
+_collectors = []
+
+# Stage durations of the request being served, for its Server-Timing header
+request_spans = ContextVar("request_spans", default=None)
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+def observe(name, seconds, **labels):
+    key = _key(name, labels)
+    with _lock:
+        entry = _histograms.get(key)
+        if entry is None:
+            entry = _histograms[key] = [[0] * len(BUCKETS), 0.0, 0]
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                entry[0][i] += 1
+                break
+        entry[1] += seconds
+        entry[2] += 1
+
+def inc(name, amount=1, **labels):
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+def observe_stage(stage, seconds):
+    observe("rommaana_stage_seconds", seconds, stage=stage)
+    spans = request_spans.get()
+    if spans is not None:
+        spans[stage] = spans.get(stage, 0.0) + seconds
+
+@contextmanager
+def span(stage):
+    """Time a block as `stage` in the latency histograms and Server-Timing."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - start)
+
+def timed(stage):
+    # Decorator form of `span`, for plain and async functions
+    def decorate(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(stage):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def outbound(target, op):
+    inc("rommaana_outbound_requests_total", target=target, op=op)
+
+def cache_event(cache, hit):
+    inc("rommaana_cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+def register_collector(fn):
+    _collectors.append(fn)
+
+def register_cache(name, cache):
+    # For caches that count their own `hits` / `misses`
+    register_collector(lambda: [
+        ("rommaana_cache_requests_total", {"cache": name, "result": "hit"}, cache.hits),
+        ("rommaana_cache_requests_total", {"cache": name, "result": "miss"}, cache.misses),
+    ])
+
+def server_timing(spans, total):
+    parts = [f"{stage};dur={seconds * 1e3:.1f}" for stage, seconds in sorted(spans.items(), key=lambda s: -s[1])]
+    parts.append(f"total;dur={total * 1e3:.1f}")
+    return ", ".join(parts)
+
+def _labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in items)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(items, escaped)) + "}"
+
+def render():
+    """All metrics in the Prometheus text exposition format."""
+    with _lock:
+        histograms = {key: (list(b), s, c) for key, (b, s, c) in _histograms.items()}
+        samples = dict(_counters)
+    for collect in _collectors:
+        try:
+            for name, labels, value in collect():
+                key = _key(name, labels)
+                samples[key] = samples.get(key, 0) + value
+        except Exception as e:
+            print(f"Metrics collector failed: {e}")
+
+    # Hit ratio per cache, derived from the request counters
+    lookups = {}
+    for (name, labels), value in samples.items():
+        if name == "rommaana_cache_requests_total":
+            labels = dict(labels)
+            hits_total = lookups.setdefault(labels["cache"], [0, 0])
+            hits_total[0] += value if labels["result"] == "hit" else 0
+            hits_total[1] += value
+    for cache, (hits, total) in lookups.items():
+        samples[_key("rommaana_cache_hit_ratio", {"cache": cache})] = hits / total if total else 0.0
+
+    lines = []
+    for family, (kind, help_text) in FAMILIES.items():
+        lines.append(f"# HELP {family} {help_text}")
+        lines.append(f"# TYPE {family} {kind}")
+        if kind == "histogram":
+            for (name, labels), (buckets, total, count) in sorted(histograms.items()):
+                if name != family:
+                    continue
+                cumulative = 0
+                for bound, n in zip(BUCKETS, buckets):
+                    cumulative += n
+                    lines.append(f"{name}_bucket{_labels(labels, [('le', repr(bound))])} {cumulative}")
+                lines.append(f"{name}_bucket{_labels(labels, [('le', '+Inf')])} {count}")
+                lines.append(f"{name}_sum{_labels(labels)} {total}")
+                lines.append(f"{name}_count{_labels(labels)} {count}")
+        else:
+            for (name, labels), value in sorted(samples.items()):
+                if name == family:
+                    lines.append(f"{name}{_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
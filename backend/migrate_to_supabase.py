@@ -1,6 +1,10 @@
 import os
 import json
-import pandas as pd
+import time
+import random
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from supabase import create_client, Client
 from dotenv import load_dotenv
 import utils
@@ -16,77 +20,166 @@ if not SUPABASE_URL or not SUPABASE_KEY:
 
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
-def migrate_candidates():
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FEEDBACK_FILE = os.path.join(BASE_DIR, "interviews.json")
+STATUS_FILE = os.path.join(BASE_DIR, "status.json")
+CHECKPOINT_PATH = os.path.join(BASE_DIR, "migration_checkpoint.json")
+
+# Defaults, overridable from the command line
+BATCH_SIZE = 200
+PARALLEL_BATCHES = 4
+MAX_RETRIES = 5
+
+class Checkpoint:
+    """Primary keys already upserted, per table, persisted after every batch."""
+
+    def __init__(self, path, reset=False):
+        self.path = path
+        self.done = {}
+        self._lock = threading.Lock()
+        if not reset and os.path.exists(path):
+            with open(path, "r") as f:
+                self.done = {table: set(keys) for table, keys in json.load(f).items()}
+            print(f"Resuming from checkpoint {path}")
+
+    def pending(self, table, rows, key):
+        done = self.done.get(table, set())
+        return [row for row in rows if row[key] not in done]
+
+    def mark(self, table, keys):
+        with self._lock:
+            self.done.setdefault(table, set()).update(keys)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({t: sorted(k) for t, k in self.done.items()}, f)
+            os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+class Stats:
+    def __init__(self):
+        self.rows = 0
+        self.bytes_sent = 0
+        self.batches = 0
+        self.retries = 0
+        self.failed_rows = 0
+        self.started = time.monotonic()
+        # Batches run on pool threads, so counters only change through `add`
+        self._lock = threading.Lock()
+
+    def add(self, **counts):
+        with self._lock:
+            for name, n in counts.items():
+                setattr(self, name, getattr(self, name) + n)
+
+    def summary(self):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return (f"{self.rows} rows in {self.batches} batches, {elapsed:.1f}s "
+                f"({self.rows / elapsed:.1f} rows/s), {self.bytes_sent / 1024 / 1024:.2f} MB sent "
+                f"({self.bytes_sent / 1024 / 1024 / elapsed:.2f} MB/s), "
+                f"{self.retries} retries, {self.failed_rows} rows failed")
+
+def upsert_batch(table, batch, stats):
+    payload_bytes = len(json.dumps(batch, default=str).encode("utf-8"))
+    for attempt in range(MAX_RETRIES):
+        try:
+            supabase.table(table).upsert(batch).execute()
+            return payload_bytes
+        except Exception as e:
+            if attempt == MAX_RETRIES - 1:
+                raise
+            stats.add(retries=1)
+            delay = min(30, 0.5 * 2 ** attempt) * (0.5 + random.random())
+            print(f"  {table}: batch of {len(batch)} failed ({e}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+def bulk_upsert(table, rows, key, checkpoint, stats, batch_size=BATCH_SIZE, workers=PARALLEL_BATCHES):
+    # Chunked upserts, at most `workers` batches in flight, checkpointed as each lands
+    todo = checkpoint.pending(table, rows, key)
+    if len(todo) < len(rows):
+        print(f"  {table}: skipping {len(rows) - len(todo)} rows already migrated")
+    batches = [todo[i:i + batch_size] for i in range(0, len(todo), batch_size)]
+    migrated = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(upsert_batch, table, batch, stats): batch for batch in batches}
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                stats.add(bytes_sent=future.result())
+            except Exception as e:
+                stats.add(failed_rows=len(batch))
+                print(f"  {table}: giving up on batch starting at {key}={batch[0][key]}: {e}")
+                continue
+            checkpoint.mark(table, [row[key] for row in batch])
+            stats.add(rows=len(batch), batches=1)
+            migrated += len(batch)
+            print(f"  {table}: {migrated}/{len(todo)} rows")
+    return migrated
+
+def migrate_candidates(checkpoint, stats, batch_size=BATCH_SIZE, workers=PARALLEL_BATCHES):
     print("Phase 1: Migrating Candidates...")
     candidates = utils.load_candidates(force_local=True)
     if not candidates:
         print("No candidates found locally.")
         return
 
-    # Prepare for bulk upsert
-    # Note: We use 'id' as the unique key if it exists, but since index was used as ID,
-    # we should check if they already exist.
-    for c in candidates:
-        # Map fields to match database schema if necessary
-        # Here we'll just push as is, but we should handle types
-        payload = {
-            "first_name": c.get("first_name"),
-            "last_name": c.get("last_name"),
-            "email": c.get("email"),
-            "phone": c.get("phone"),
-            "role": c.get("role"),
-            "skills": c.get("skills"),
-            "resume_url": c.get("resume_url"),
-            "local_filename": c.get("local_filename"),
-            "resume_text": c.get("resume_text"),
-            "id": c.get("id")
-        }
-        try:
-            supabase.table("candidates").upsert(payload).execute()
-        except Exception as e:
-            print(f"Failed to upsert candidate {c.get('email')}: {e}")
-    print(f"Successfully migrated/updated {len(candidates)} candidates.")
+    # Note: We use 'id' as the unique key, since the CSV index was used as ID
+    rows = [{
+        "first_name": c.get("first_name"),
+        "last_name": c.get("last_name"),
+        "email": c.get("email"),
+        "phone": c.get("phone"),
+        "role": c.get("role"),
+        "skills": c.get("skills"),
+        "resume_url": c.get("resume_url"),
+        "local_filename": c.get("local_filename"),
+        "resume_text": c.get("resume_text"),
+        "id": c.get("id")
+    } for c in candidates]
+    migrated = bulk_upsert("candidates", rows, "id", checkpoint, stats, batch_size, workers)
+    print(f"Successfully migrated/updated {migrated} candidates.")
 
-def migrate_feedback_and_status():
+def migrate_feedback_and_status(checkpoint, stats, batch_size=BATCH_SIZE, workers=PARALLEL_BATCHES):
     print("\nPhase 2: Migrating Feedback and Status...")
-    
-    # Load local data
-    feedback = utils.load_cache() # Actually utils.load_cache is for metadata_cache, let's use main's paths
-    # We can just use the files directly or import from main
-    
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-    FEEDBACK_FILE = os.path.join(BASE_DIR, "interviews.json")
-    STATUS_FILE = os.path.join(BASE_DIR, "status.json")
 
     if os.path.exists(FEEDBACK_FILE):
         with open(FEEDBACK_FILE, "r") as f:
             fb_data = json.load(f)
-            for cid, data in fb_data.items():
-                try:
-                    supabase.table("interviews_feedback").upsert({
-                        "candidate_id": int(cid),
-                        "rating": data.get("rating"),
-                        "notes": data.get("notes")
-                    }).execute()
-                except Exception as e:
-                    print(f"Failed feedback {cid}: {e}")
-            print(f"Migrated {len(fb_data)} feedback entries.")
+        rows = [{
+            "candidate_id": int(cid),
+            "rating": data.get("rating"),
+            "notes": data.get("notes")
+        } for cid, data in fb_data.items()]
+        migrated = bulk_upsert("interviews_feedback", rows, "candidate_id", checkpoint, stats, batch_size, workers)
+        print(f"Migrated {migrated} feedback entries.")
 
     if os.path.exists(STATUS_FILE):
         with open(STATUS_FILE, "r") as f:
             st_data = json.load(f)
-            for cid, status in st_data.items():
-                try:
-                    supabase.table("candidate_status").upsert({
-                        "candidate_id": int(cid),
-                        "status": status
-                    }).execute()
-                except Exception as e:
-                    print(f"Failed status {cid}: {e}")
-            print(f"Migrated {len(st_data)} status entries.")
+        rows = [{"candidate_id": int(cid), "status": status} for cid, status in st_data.items()]
+        migrated = bulk_upsert("candidate_status", rows, "candidate_id", checkpoint, stats, batch_size, workers)
+        print(f"Migrated {migrated} status entries.")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate local candidates, feedback and status to Supabase")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="rows per upsert request")
+    parser.add_argument("--workers", type=int, default=PARALLEL_BATCHES, help="batches in flight at once")
+    parser.add_argument("--retries", type=int, default=MAX_RETRIES, help="attempts per batch before giving up")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH, help="resume checkpoint file")
+    parser.add_argument("--reset", action="store_true", help="ignore any existing checkpoint and start over")
+    args = parser.parse_args()
+    MAX_RETRIES = max(1, args.retries)
+
     print("Starting Cloud Migration to Supabase...")
-    migrate_candidates()
-    migrate_feedback_and_status()
-    print("\nMigration Complete! Your dashboard is now cloud-ready.")
+    checkpoint = Checkpoint(args.checkpoint, reset=args.reset)
+    stats = Stats()
+    migrate_candidates(checkpoint, stats, args.batch_size, args.workers)
+    migrate_feedback_and_status(checkpoint, stats, args.batch_size, args.workers)
+    print(f"\nThroughput: {stats.summary()}")
+    if stats.failed_rows:
+        print(f"{stats.failed_rows} rows failed; re-run to resume from {args.checkpoint}.")
+    else:
+        checkpoint.clear()
+        print("\nMigration Complete! Your dashboard is now cloud-ready.")
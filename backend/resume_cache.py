@@ -0,0 +1,174 @@
+import os
+import fast_json
+import time
+import sqlite3
+import threading
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    key TEXT PRIMARY KEY,
+    role TEXT,
+    skills TEXT,
+    locations TEXT,
+    languages TEXT,
+    text TEXT,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sources (
+    source TEXT PRIMARY KEY,
+    key TEXT NOT NULL,
+    file_size INTEGER,
+    file_mtime REAL
+);
+CREATE INDEX IF NOT EXISTS resumes_accessed ON resumes(accessed);
+CREATE INDEX IF NOT EXISTS sources_key ON sources(key);
+"""
+
+# Reads only note recency in memory; it is written back at most this often (and before any eviction)
+TOUCH_FLUSH_INTERVAL = 60
+
+def _compact(value):
+    # Stored as TEXT, so older rows and these decode the same way
+    return fast_json.dumps(value).decode("utf-8")
+
+class ResumeCache:
+    """Content-addressed store of extracted resume text and classifier output.
+
+    Entries are keyed by the SHA-256 of the PDF bytes, and a separate
+    `sources` table maps each URL/local path to its content key, so the CSV
+    row order never matters and identical files are stored once. Lookups
+    return metadata only; the text column is read on demand. Every update is
+    a single-row write, and the least recently used entries are evicted when
+    the total text size exceeds `max_bytes`. Evicted keys are collected for
+    `pop_evicted`, so callers holding on to a key know to extract it again.
+    """
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._conn = None
+        self._total_bytes = 0
+        # key -> last read time, not yet written to the `accessed` column
+        self._touched = {}
+        self._flushed_at = time.monotonic()
+        self._evicted = set()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _db(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._total_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM resumes").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _stat(source):
+        if source.startswith("http"):
+            return None, None
+        try:
+            st = os.stat(source)
+            return st.st_size, st.st_mtime
+        except OSError:
+            return None, None
+
+    def lookup(self, sources):
+        """Map each source to its cached metadata (without text), if still valid."""
+        found = {}
+        with self._lock:
+            db = self._db()
+            for source in sources:
+                row = db.execute(
+                    "SELECT r.key, r.role, r.skills, r.locations, r.languages, s.file_size, s.file_mtime "
+                    "FROM sources s JOIN resumes r ON r.key = s.key WHERE s.source = ?", (source,)
+                ).fetchone()
+                if not row:
+                    self.misses += 1
+                    continue
+                # Local files are revalidated by size/mtime so edits are re-extracted
+                if (row[5], row[6]) != self._stat(source):
+                    self.misses += 1
+                    continue
+                self.hits += 1
+                found[source] = {
+                    "key": row[0],
+                    "role": row[1],
+                    "skills": fast_json.loads(row[2]),
+                    "locations": fast_json.loads(row[3]),
+                    "languages": fast_json.loads(row[4])
+                }
+        return found
+
+    def get_texts(self, keys):
+        keys = list(keys)
+        texts = {}
+        with self._lock:
+            db = self._db()
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                texts.update(db.execute(f"SELECT key, text FROM resumes WHERE key IN ({marks})", chunk).fetchall())
+            now = time.time()
+            self._touched.update((key, now) for key in texts)
+            if time.monotonic() - self._flushed_at > TOUCH_FLUSH_INTERVAL:
+                self._flush_touched(db)
+                db.commit()
+        return texts
+
+    def _flush_touched(self, db):
+        if self._touched:
+            db.executemany("UPDATE resumes SET accessed = ? WHERE key = ?", [(t, key) for key, t in self._touched.items()])
+            self._touched = {}
+        self._flushed_at = time.monotonic()
+
+    def pop_evicted(self):
+        # Keys evicted since the last call
+        with self._lock:
+            evicted, self._evicted = self._evicted, set()
+            return evicted
+
+    def get_text(self, key):
+        return self.get_texts([key]).get(key)
+
+    def put(self, source, key, metadata):
+        text = metadata.get("text") or ""
+        size = len(text.encode("utf-8", "ignore"))
+        file_size, file_mtime = self._stat(source)
+        with self._lock:
+            db = self._db()
+            old = db.execute("SELECT size FROM resumes WHERE key = ?", (key,)).fetchone()
+            db.execute(
+                "INSERT OR REPLACE INTO resumes (key, role, skills, locations, languages, text, size, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, metadata.get("role"), _compact(metadata.get("skills", [])),
+                 _compact(metadata.get("locations", [])), _compact(metadata.get("languages", [])),
+                 text, size, time.time())
+            )
+            db.execute(
+                "INSERT OR REPLACE INTO sources (source, key, file_size, file_mtime) VALUES (?, ?, ?, ?)",
+                (source, key, file_size, file_mtime)
+            )
+            self._total_bytes += size - (old[0] if old else 0)
+            self._evict(db)
+            db.commit()
+
+    def _evict(self, db):
+        if self._total_bytes > self.max_bytes:
+            self._flush_touched(db)
+        while self._total_bytes > self.max_bytes:
+            rows = db.execute("SELECT key, size FROM resumes ORDER BY accessed LIMIT 32").fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                db.execute("DELETE FROM resumes WHERE key = ?", (key,))
+                db.execute("DELETE FROM sources WHERE key = ?", (key,))
+                self._touched.pop(key, None)
+                self._evicted.add(key)
+                self._total_bytes -= size
+                if self._total_bytes <= self.max_bytes:
+                    break
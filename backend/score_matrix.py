@@ -0,0 +1,218 @@
+import os
+import json
+import threading
+import numpy as np
+from jd_profile import JDProfiles, score_table
+
+# Above this share of changed resumes a full vectorized rebuild beats row-by-row patching
+REBUILD_FRACTION = 0.25
+
+class ScoreMatrix:
+    """Materialized candidate x job keyword scores.
+
+    `counts[row, col]` is how many of job `col`'s JD keywords appear in the
+    resume of candidate `doc_ids[row]`, and `bits[col][row]` records which
+    ones as a packed bitset over the job's sorted keyword list. Scores are the
+    same percentages as `utils.score_candidate`, read through the job's
+    compiled profile. `refresh` keeps it in step with the keyword index and the job list:
+    new or changed resumes only recompute their own rows, and an edited job
+    only its own column. The arrays are persisted next to the keyword index.
+    """
+
+    def __init__(self, index, path=None, profiles=None):
+        self.index = index
+        self.path = path
+        self.profiles = profiles if profiles is not None else JDProfiles()
+        self.doc_ids = np.empty(0, dtype=np.int64)
+        self.doc_fps = {}
+        self.rows = {}
+        self.jobs = {}
+        self.counts = np.zeros((0, 0), dtype=np.uint16)
+        self.bits = []
+        self._index_version = None
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    # --- persistence ---
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                meta = json.loads(str(data["meta"]))
+                self.doc_ids = data["doc_ids"].astype(np.int64)
+                self.counts = data["counts"].astype(np.uint16)
+                self.bits = [data[f"bits_{col}"] for col in range(len(meta["jobs"]))]
+            self.doc_fps = {int(cid): fp for cid, fp in meta["doc_fps"].items()}
+            self.jobs = {job["id"]: job for job in meta["jobs"]}
+            self.rows = {cid: row for row, cid in enumerate(self.doc_ids.tolist())}
+        except Exception as e:
+            print(f"Score matrix unreadable, rebuilding: {e}")
+            self.doc_ids = np.empty(0, dtype=np.int64)
+            self.doc_fps, self.rows, self.jobs, self.bits = {}, {}, {}, []
+            self.counts = np.zeros((0, 0), dtype=np.uint16)
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            meta = {
+                "doc_fps": {str(cid): fp for cid, fp in self.doc_fps.items()},
+                "jobs": sorted(self.jobs.values(), key=lambda job: job["col"])
+            }
+            arrays = {f"bits_{col}": bits for col, bits in enumerate(self.bits)}
+            try:
+                tmp_path = self.path + ".tmp.npz"
+                np.savez(tmp_path, meta=np.array(json.dumps(meta)), doc_ids=self.doc_ids, counts=self.counts, **arrays)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                print(f"Failed to persist score matrix: {e}")
+
+    # --- maintenance ---
+
+    def refresh(self, jobs):
+        """Bring the matrix up to date with the keyword index and `jobs`."""
+        with self._lock:
+            self._ensure_loaded()
+            changed = False
+            version, docs = self.index.fingerprints()
+            if version != self._index_version:
+                changed = self._sync_docs(docs)
+                self._index_version = version
+            changed = self._sync_jobs(jobs) or changed
+            if changed:
+                self.save()
+
+    def set_job(self, job):
+        # Recompute one job's column right away, e.g. after its description was edited
+        with self._lock:
+            self._ensure_loaded()
+            if self._sync_jobs([job], drop_missing=False):
+                self.save()
+
+    def _sync_jobs(self, jobs, drop_missing=True):
+        wanted = {job["id"]: self.profiles.for_job(job) for job in jobs if job.get("id") is not None}
+        stale = [jid for jid, profile in wanted.items()
+                 if jid not in self.jobs or self.jobs[jid]["fp"] != profile.fingerprint]
+        gone = [jid for jid in self.jobs if jid not in wanted] if drop_missing else []
+        if gone:
+            keep = sorted((self.jobs[jid] for jid in self.jobs if jid not in gone), key=lambda job: job["col"])
+            self.counts = self.counts[:, [job["col"] for job in keep]]
+            self.bits = [self.bits[job["col"]] for job in keep]
+            self.jobs = {}
+            for col, job in enumerate(keep):
+                self.jobs[job["id"]] = dict(job, col=col)
+        for jid in stale:
+            profile = wanted[jid]
+            entry = {
+                "id": jid,
+                "fp": profile.fingerprint,
+                "keywords": list(profile.keywords),
+                "col": self.jobs[jid]["col"] if jid in self.jobs else len(self.jobs)
+            }
+            if entry["col"] == self.counts.shape[1]:
+                self.counts = np.hstack([self.counts, np.zeros((len(self.doc_ids), 1), dtype=np.uint16)])
+                self.bits.append(None)
+            self.jobs[jid] = entry
+            self._fill_column(entry)
+        return bool(stale or gone)
+
+    def _sync_docs(self, docs):
+        removed = [cid for cid in self.doc_fps if cid not in docs]
+        changed = [cid for cid, fp in docs.items() if self.doc_fps.get(cid) != fp]
+        if not removed and not changed:
+            return False
+        if removed or len(changed) > REBUILD_FRACTION * max(len(docs), 1):
+            self._rebuild(docs)
+            return True
+        new = [cid for cid in changed if cid not in self.rows]
+        if new:
+            self.doc_ids = np.concatenate([self.doc_ids, np.array(new, dtype=np.int64)])
+            self.counts = np.vstack([self.counts, np.zeros((len(new), len(self.bits)), dtype=np.uint16)])
+            self.bits = [np.vstack([b, np.zeros((len(new), b.shape[1]), dtype=np.uint8)]) for b in self.bits]
+            for cid in new:
+                self.rows[cid] = len(self.rows)
+        for cid in changed:
+            self._fill_row(cid)
+            self.doc_fps[cid] = docs[cid]
+        return True
+
+    def _rebuild(self, docs):
+        self.doc_ids, _ = self.index.hit_rows([])
+        self.rows = {cid: row for row, cid in enumerate(self.doc_ids.tolist())}
+        self.doc_fps = {cid: docs[cid] for cid in self.rows if cid in docs}
+        self.counts = np.zeros((len(self.doc_ids), len(self.jobs)), dtype=np.uint16)
+        self.bits = [None] * len(self.jobs)
+        for job in self.jobs.values():
+            self._fill_column(job)
+
+    def _fill_column(self, job):
+        # One vectorized pass per JD keyword over the index postings
+        keywords = job["keywords"]
+        index_ids, vectors = self.index.hit_rows(keywords)
+        # Index rows -> matrix rows; any resume the matrix has not seen yet is picked up by the next doc sync
+        lookup = np.array([self.rows.get(cid, -1) for cid in index_ids.tolist()], dtype=np.int64)
+        bits = np.zeros((len(self.doc_ids), max(1, (len(keywords) + 7) // 8)), dtype=np.uint8)
+        counts = np.zeros(len(self.doc_ids), dtype=np.uint16)
+        for k, hits in enumerate(vectors):
+            rows = lookup[hits]
+            rows = rows[rows >= 0]
+            bits[rows, k >> 3] |= np.uint8(1 << (k & 7))
+            counts[rows] += 1
+        self.bits[job["col"]] = bits
+        self.counts[:, job["col"]] = counts
+
+    def _fill_row(self, cid):
+        row = self.rows[cid]
+        for job in self.jobs.values():
+            hits = set(self.index.matched(cid, job["keywords"]))
+            flags = np.array([kw in hits for kw in job["keywords"]], dtype=bool)
+            packed = np.packbits(flags, bitorder="little")
+            self.bits[job["col"]][row] = 0
+            self.bits[job["col"]][row, :len(packed)] = packed
+            self.counts[row, job["col"]] = len(hits)
+
+    # --- reads ---
+
+    @staticmethod
+    def _score_table(job):
+        return score_table(len(job["keywords"]))
+
+    def _matches(self, job, row):
+        flags = np.unpackbits(self.bits[job["col"]][row], bitorder="little")[:len(job["keywords"])]
+        return [kw for kw, hit in zip(job["keywords"], flags.tolist()) if hit]
+
+    def score(self, cid, job_id):
+        """(score, matched keywords) of one candidate for one job, or None if either is unknown."""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            row = self.rows.get(cid)
+            if job is None or row is None:
+                return None
+            count = int(self.counts[row, job["col"]])
+            return float(self._score_table(job)[count]), self._matches(job, row)
+
+    def candidate_scores(self, cid):
+        # {job id: (score, matched keywords)} across every job
+        with self._lock:
+            if cid not in self.rows:
+                return {}
+            return {jid: self.score(cid, jid) for jid in self.jobs}
+
+    def job_scores(self, job_id):
+        """(doc_ids, scores) of every candidate for one job, as arrays."""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return np.empty(0, dtype=np.int64), np.empty(0)
+            return self.doc_ids.copy(), self._score_table(job)[self.counts[:, job["col"]]]
+
+    def matches(self, cid, job_id):
+        with self._lock:
+            job = self.jobs.get(job_id)
+            row = self.rows.get(cid)
+            return self._matches(job, row) if job is not None and row is not None else []
@@ -0,0 +1,164 @@
+import re
+import html
+import sqlite3
+import threading
+from collections import OrderedDict
+
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS docs USING fts5(
+    name, skills, locations, text,
+    tokenize = 'porter unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+CREATE TABLE IF NOT EXISTS doc_meta (
+    candidate_id INTEGER PRIMARY KEY,
+    fingerprint TEXT NOT NULL
+);
+"""
+
+COLUMNS = ("name", "skills", "locations", "text")
+# bm25() column weights: a hit in the name or skills outranks one buried in the resume body
+WEIGHTS = (10.0, 5.0, 2.0, 1.0)
+SNIPPET_TOKENS = 16
+# Control characters FTS5 wraps around hits; swapped for <mark> only after the snippet is HTML-escaped
+MARK_OPEN, MARK_CLOSE = "\x02", "\x03"
+_STRIP_MARKS = str.maketrans({MARK_OPEN: " ", MARK_CLOSE: " "})
+# Result pages kept per query, so repeating a search skips re-ranking every match
+RESULT_CACHE_SIZE = 256
+
+_QUERY_RE = re.compile(r'"([^"]*)"?|(\S+)')
+_TOKEN_RE = re.compile(r"\w+")
+
+def to_match(query):
+    """Translate a search box query into an FTS5 MATCH expression, or None if it has no terms.
+
+    Terms are ANDed; "quoted text" is a phrase, a trailing * makes a prefix
+    match and a bare OR between terms is kept. Everything else that FTS5
+    would treat as syntax is dropped, so no user input is a syntax error.
+    """
+    terms = []
+    for phrase, word in _QUERY_RE.findall(query or ""):
+        if word == "OR":
+            if terms and terms[-1] != "OR":
+                terms.append("OR")
+            continue
+        tokens = _TOKEN_RE.findall(phrase if phrase else word)
+        if not tokens:
+            continue
+        term = '"%s"' % " ".join(tokens)
+        if word.endswith("*"):
+            term += "*"
+        terms.append(term)
+    while terms and terms[-1] == "OR":
+        terms.pop()
+    return " ".join(terms) or None
+
+def highlight(snippet):
+    # Resume text is untrusted: escape it, then turn the hit sentinels into markup
+    return html.escape(snippet).replace(MARK_OPEN, "<mark>").replace(MARK_CLOSE, "</mark>")
+
+class SearchIndex:
+    """Full-text index (SQLite FTS5) over candidate names, skills, locations and resume text.
+
+    Rows are keyed by candidate id and carry a caller-supplied fingerprint, so
+    `sync` only rewrites candidates whose content changed. Queries are ranked
+    by BM25 with per-column weights and return a highlighted snippet.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        # candidate id -> fingerprint of what is indexed
+        self._fingerprints = None
+        # (MATCH expression, offset, limit) -> search result, emptied on every write
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _db(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._fingerprints = dict(conn.execute("SELECT candidate_id, fingerprint FROM doc_meta"))
+            self._conn = conn
+        return self._conn
+
+    def sync(self, fingerprints, load_docs, defer=None):
+        """Bring the index in line with {candidate id: fingerprint}.
+
+        Candidates no longer listed are dropped. New or changed ones are
+        indexed from `load_docs(ids)` ({id: (fingerprint, document)}), or
+        handed to `defer(ids)` so the caller can index them in the background.
+        """
+        with self._lock:
+            db = self._db()
+            removed = [cid for cid in self._fingerprints if cid not in fingerprints]
+            stale = [cid for cid, fp in fingerprints.items() if self._fingerprints.get(cid) != fp]
+            if removed:
+                self._delete(db, removed)
+                db.commit()
+        if stale and defer:
+            defer(stale)
+        elif stale:
+            self.add_many(load_docs(stale))
+
+    def add_many(self, docs):
+        # docs: {candidate id: (fingerprint, {column: text})}
+        with self._lock:
+            db = self._db()
+            self._delete(db, list(docs))
+            db.executemany(
+                "INSERT INTO docs (rowid, name, skills, locations, text) VALUES (?, ?, ?, ?, ?)",
+                [(cid, *((doc.get(col) or "").translate(_STRIP_MARKS) for col in COLUMNS))
+                 for cid, (_, doc) in docs.items()]
+            )
+            db.executemany(
+                "INSERT INTO doc_meta (candidate_id, fingerprint) VALUES (?, ?)",
+                [(cid, fp) for cid, (fp, _) in docs.items()]
+            )
+            db.commit()
+            self._fingerprints.update((cid, fp) for cid, (fp, _) in docs.items())
+            self._results.clear()
+
+    def add(self, candidate_id, document, fingerprint):
+        self.add_many({candidate_id: (fingerprint, document)})
+
+    def _delete(self, db, ids):
+        self._results.clear()
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            db.execute(f"DELETE FROM docs WHERE rowid IN ({marks})", chunk)
+            db.execute(f"DELETE FROM doc_meta WHERE candidate_id IN ({marks})", chunk)
+        for cid in ids:
+            self._fingerprints.pop(cid, None)
+
+    def search(self, query, offset=0, limit=20):
+        """Returns (total matches, [(candidate id, score, snippet)]) for one page, best first.
+
+        Raises ValueError when the query has no searchable terms.
+        """
+        match = to_match(query)
+        if match is None:
+            raise ValueError("Query has no searchable terms")
+        key = (match, offset, limit)
+        weights = ", ".join(str(w) for w in WEIGHTS)
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key]
+            db = self._db()
+            total = db.execute("SELECT count(*) FROM docs WHERE docs MATCH ?", (match,)).fetchone()[0]
+            rows = db.execute(
+                f"SELECT rowid, bm25(docs, {weights}) AS rank, "
+                f"snippet(docs, -1, char(2), char(3), '…', {SNIPPET_TOKENS}) "
+                f"FROM docs WHERE docs MATCH ? ORDER BY rank, rowid LIMIT ? OFFSET ?",
+                (match, limit, offset)
+            ).fetchall()
+            # bm25() is lower-is-better; flip it so bigger scores rank higher
+            result = total, [(cid, round(-rank, 6), highlight(snippet)) for cid, rank, snippet in rows]
+            self._results[key] = result
+            if len(self._results) > RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+        return result
@@ -0,0 +1,74 @@
+"""Precomputed startup data for cold starts.
+
+Holds the classifier's compiled vocabulary matcher and the keyword lists of
+the job descriptions in jobs.json. Regenerate at build/deploy time:
+
+    python snapshot.py
+
+Every section is keyed by a hash of its inputs, so a stale snapshot is
+simply ignored and the data is computed as before.
+"""
+import os
+import json
+import hashlib
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_PATH = os.path.join(BASE_DIR, "startup_snapshot.json")
+
+_data = None
+
+def _load():
+    global _data
+    if _data is None:
+        _data = {}
+        try:
+            with open(SNAPSHOT_PATH, "r") as f:
+                _data = json.load(f)
+        except (OSError, ValueError):
+            pass
+    return _data
+
+def vocabulary_key(terms):
+    return hashlib.sha1("\n".join(terms).encode("utf-8")).hexdigest()[:16]
+
+def get(section, key):
+    # Section value, only if it was built from the same inputs
+    entry = _load().get(section)
+    if entry and entry.get("key") == key:
+        return entry["value"]
+    return None
+
+def job_keywords(description_fp):
+    # Sorted JD keywords of a job description, by its fingerprint
+    return (_load().get("jobs") or {}).get("value", {}).get(description_fp)
+
+def build():
+    import classifier
+    from keyword_index import jd_keywords
+    from jd_profile import job_fingerprint
+
+    with open(os.path.join(BASE_DIR, "jobs.json"), "r") as f:
+        jobs = json.load(f)
+    data = {
+        "classifier": {
+            "key": vocabulary_key(classifier._ALL_TERMS),
+            "value": {
+                "pattern": classifier._MATCHER.pattern,
+                "prefix_terms": classifier._PREFIX_TERMS
+            }
+        },
+        "jobs": {
+            "key": "description-fingerprint",
+            "value": {job_fingerprint(job.get("description")): sorted(jd_keywords(job.get("description") or "")) for job in jobs}
+        }
+    }
+    tmp_path = SNAPSHOT_PATH + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, separators=(",", ":"), sort_keys=True)
+    os.replace(tmp_path, SNAPSHOT_PATH)
+    return data
+
+if __name__ == "__main__":
+    data = build()
+    print(f"Wrote {SNAPSHOT_PATH}: {len(data['classifier']['value']['prefix_terms'])} classifier terms, "
+          f"{len(data['jobs']['value'])} job descriptions")
@@ -0,0 +1,98 @@
+import math
+import threading
+from collections import Counter
+import numpy as np
+from keyword_index import clean_text, is_keyword
+
+SCORING_MODES = ("percent", "bm25", "tfidf")
+
+class TermMatrix:
+    """Sparse term-frequency matrix over every indexed resume, for weighted ranking.
+
+    Each resume is tokenized once into (term ids, term counts); the corpus is
+    laid out column-wise (CSC: per term, the rows that contain it and their
+    counts) and rebuilt from those cached vectors only when the set of
+    resumes changes. Scoring a JD is a single sparse matrix-vector product
+    over the columns of its keywords, weighted by BM25 or cosine TF-IDF, so
+    rare terms like "kubernetes" outrank common ones like "team".
+    """
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.vocab = {}
+        # candidate id -> (fingerprint, term ids, term counts)
+        self.docs = {}
+        self._csc = None
+        self._lock = threading.RLock()
+
+    def refresh(self, fingerprints, load_texts):
+        """Sync with {candidate id: fingerprint}; `load_texts(ids)` returns {id: text} for new/changed ones."""
+        with self._lock:
+            removed = [cid for cid in self.docs if cid not in fingerprints]
+            stale = [cid for cid, fp in fingerprints.items() if cid not in self.docs or self.docs[cid][0] != fp]
+            for cid in removed:
+                del self.docs[cid]
+            texts = load_texts(stale) if stale else {}
+            for cid in stale:
+                self.docs[cid] = (fingerprints[cid], *self._vectorize(texts.get(cid) or ""))
+            if removed or stale:
+                self._csc = None
+
+    def _vectorize(self, text):
+        counts = Counter(w for w in clean_text(text).split() if is_keyword(w))
+        ids = np.fromiter((self.vocab.setdefault(w, len(self.vocab)) for w in counts), dtype=np.int32, count=len(counts))
+        return ids, np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+
+    def _build(self):
+        doc_ids = np.array(sorted(self.docs), dtype=np.int64)
+        vectors = [self.docs[cid] for cid in doc_ids.tolist()]
+        terms = np.concatenate([v[1] for v in vectors]) if vectors else np.empty(0, dtype=np.int32)
+        tfs = np.concatenate([v[2] for v in vectors]) if vectors else np.empty(0)
+        rows = np.repeat(np.arange(len(doc_ids)), [len(v[1]) for v in vectors])
+        order = np.argsort(terms, kind="stable")
+        terms, rows, tfs = terms[order], rows[order], tfs[order]
+        indptr = np.searchsorted(terms, np.arange(len(self.vocab) + 1))
+        df = np.diff(indptr)
+        n = len(doc_ids)
+        doc_len = np.bincount(rows, weights=tfs, minlength=n)
+        idf = np.log((1 + n) / (1 + df)) + 1
+        norms = np.sqrt(np.bincount(rows, weights=((1 + np.log(tfs)) * idf[terms]) ** 2, minlength=n))
+        self._csc = {
+            "doc_ids": doc_ids, "indptr": indptr, "rows": rows, "tfs": tfs, "df": df,
+            "doc_len": doc_len, "avgdl": doc_len.mean() if n else 0.0,
+            "idf": idf, "norms": np.where(norms > 0, norms, 1.0)
+        }
+        return self._csc
+
+    def score(self, keywords, mode="bm25"):
+        """Weighted score of a JD's keywords against every resume.
+
+        Returns (doc_ids, scores) with doc_ids sorted ascending. `mode` is
+        "bm25" (Okapi BM25) or "tfidf" (cosine similarity of TF-IDF vectors).
+        """
+        with self._lock:
+            m = self._csc or self._build()
+            doc_ids = m["doc_ids"]
+            terms = [self.vocab[kw] for kw in keywords if kw in self.vocab]
+        n = len(doc_ids)
+        if not terms or not n:
+            return doc_ids, np.zeros(n)
+        indptr = m["indptr"]
+        cols = np.concatenate([np.arange(indptr[t], indptr[t + 1]) for t in terms])
+        col_terms = np.repeat(terms, [indptr[t + 1] - indptr[t] for t in terms])
+        rows, tf = m["rows"][cols], m["tfs"][cols]
+
+        if mode == "bm25":
+            df = m["df"][col_terms]
+            idf = np.log((n - df + 0.5) / (df + 0.5) + 1)
+            length_norm = self.k1 * (1 - self.b + self.b * m["doc_len"][rows] / max(m["avgdl"], 1e-9))
+            weights = idf * tf * (self.k1 + 1) / (tf + length_norm)
+        elif mode == "tfidf":
+            idf = m["idf"]
+            # Query vector: one occurrence of each JD keyword, so its weights are just the idfs
+            query_norm = math.sqrt(float(np.sum(idf[terms] ** 2)))
+            weights = (1 + np.log(tf)) * idf[col_terms] ** 2 / (m["norms"][rows] * query_norm)
+        else:
+            raise ValueError(f"Unknown scoring mode: {mode}")
+        return doc_ids, np.bincount(rows, weights=weights, minlength=n)
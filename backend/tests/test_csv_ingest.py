@@ -0,0 +1,50 @@
+from csv_ingest import CsvIngestor
+
+HEADER = b"Full Name,Email\n"
+
+def names(rows):
+    return [row["Full Name"] for row in rows]
+
+def test_last_row_without_newline_is_read(tmp_path):
+    path = tmp_path / "export.csv"
+    path.write_bytes(HEADER + b"Ada,ada@example.com\nGrace,grace@example.com")
+    rows, first_new, rebuilt = CsvIngestor(str(path)).read()
+    assert rebuilt and first_new == 0
+    assert names(rows) == ["Ada", "Grace"]
+    assert rows[1]["Email"] == "grace@example.com"
+
+def test_appended_row_without_newline_is_read_once_settled(tmp_path):
+    path = tmp_path / "export.csv"
+    path.write_bytes(HEADER + b"Ada,ada@example.com\n")
+    ingestor = CsvIngestor(str(path))
+    assert names(ingestor.read()[0]) == ["Ada"]
+
+    with open(path, "ab") as f:
+        f.write(b'"Hopper, Grace",grace@example.com')
+    # Still growing as far as this poll can tell
+    rows, first_new, rebuilt = ingestor.read()
+    assert names(rows) == ["Ada"] and not rebuilt
+    # Same size on the next poll: the row is complete
+    rows, first_new, rebuilt = ingestor.read()
+    assert names(rows[first_new:]) == ["Hopper, Grace"] and not rebuilt
+
+    with open(path, "ab") as f:
+        f.write(b"\nAlan,alan@example.com\n")
+    rows, first_new, rebuilt = ingestor.read()
+    assert names(rows) == ["Ada", "Hopper, Grace", "Alan"] and not rebuilt
+    assert names(rows[first_new:]) == ["Alan"]
+
+def test_unterminated_quote_is_not_taken_incrementally(tmp_path):
+    path = tmp_path / "export.csv"
+    path.write_bytes(HEADER + b"Ada,ada@example.com\n")
+    ingestor = CsvIngestor(str(path))
+    ingestor.read()
+    with open(path, "ab") as f:
+        f.write(b'"Grace\nHop')
+    ingestor.read()
+    assert names(ingestor.read()[0]) == ["Ada"]
+    with open(path, "ab") as f:
+        f.write(b'per",grace@example.com\n')
+    rows, _, rebuilt = ingestor.read()
+    assert names(rows) == ["Ada", "Grace\nHopper"] and not rebuilt
+    assert rows[1]["Email"] == "grace@example.com"
@@ -0,0 +1,79 @@
+import os
+import time
+import pytest
+import extraction
+
+def write_pdf(path, text, lines=1):
+    # Minimal valid one-page PDF whose text pypdf can extract; more lines make it slower to parse
+    stream = ("BT /F1 12 Tf 72 720 Td " + " 0 -14 Td ".join(f"({text}) Tj" for _ in range(lines)) + " ET").encode()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+def run_batch(sources, **kwargs):
+    results, errors = {}, {}
+    def progress(done, total, key, error=None):
+        if error:
+            errors[key] = error
+    extraction.extract_texts(sources, lambda key, text, digest: results.__setitem__(key, text), progress=progress, **kwargs)
+    return results, errors
+
+def parse_or_hang(path):
+    # Module-level so the process pool can pickle it
+    if "hang" in os.path.basename(path):
+        time.sleep(600)
+    return extraction.stream_to_text(open(path, "rb"))
+
+def test_queued_parses_never_time_out(tmp_path):
+    # Far more files than one worker gets through within the timeout; waiting in line is not a hang
+    sources = {}
+    for i in range(200):
+        path = str(tmp_path / f"resume_{i}.pdf")
+        write_pdf(path, f"Candidate {i} Python", lines=80)
+        sources[path] = path
+    results, errors = run_batch(sources, parse_workers=1, parse_timeout=0.4)
+    assert errors == {}
+    assert len(results) == 200
+    assert all("Python" in text for text in results.values())
+
+def test_hung_parse_is_killed_and_the_rest_survive(tmp_path, monkeypatch):
+    monkeypatch.setattr(extraction, "pdf_file_to_text", parse_or_hang)
+    sources = {}
+    for name in ["a", "b", "hang", "c", "d", "e"]:
+        path = str(tmp_path / f"{name}.pdf")
+        write_pdf(path, f"Resume {name}")
+        sources[path] = path
+    start = time.monotonic()
+    results, errors = run_batch(sources, parse_workers=2, parse_timeout=1.0)
+    assert time.monotonic() - start < 30
+    assert [os.path.basename(key) for key in errors] == ["hang.pdf"]
+    assert isinstance(errors[str(tmp_path / "hang.pdf")], TimeoutError)
+    assert len(results) == 5
+
+def test_single_parse_times_out_and_pool_recovers(tmp_path, monkeypatch):
+    monkeypatch.setattr(extraction, "pdf_file_to_text", parse_or_hang)
+    hang, ok = str(tmp_path / "hang.pdf"), str(tmp_path / "ok.pdf")
+    write_pdf(hang, "Resume hang")
+    write_pdf(ok, "Resume ok")
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        extraction.extract_source(hang, parse_timeout=1.0)
+    assert time.monotonic() - start < 30
+    text, digest = extraction.extract_source(ok, parse_timeout=10)
+    assert "Resume ok" in text and len(digest) == 64
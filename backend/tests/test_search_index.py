@@ -0,0 +1,13 @@
+from search_index import SearchIndex
+
+def test_snippet_escapes_resume_text(tmp_path):
+    index = SearchIndex(str(tmp_path / "search.sqlite3"))
+    text = 'Python developer <script>alert("x")</script> & \x02tester\x03'
+    index.add(1, {"name": "Ada", "text": text}, "fp1")
+    total, hits = index.search("python")
+    assert total == 1
+    snippet = hits[0][2]
+    assert "<script>" not in snippet
+    assert "&lt;script&gt;" in snippet and "&amp;" in snippet
+    assert snippet.count("<mark>") == snippet.count("</mark>") == 1
+    assert "<mark>Python</mark>" in snippet
@@ -1,4 +1,8 @@
 import os
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
@@ -13,37 +17,92 @@ if not SUPABASE_URL or not SUPABASE_KEY:
 
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
-def update_urls():
-    print("Fetching candidates from cloud...")
-    res = supabase.table("candidates").select("id, local_filename").execute()
-    candidates = res.data
-    
-    if not candidates:
-        print("No candidates found in Supabase.")
-        return
+BATCH_SIZE = 500
+VERIFY_WORKERS = 16
 
-    print(f"Updating {len(candidates)} candidates...")
-    
+def storage_base_url():
     # Base URL for public storage objects
     # Pattern: https://[ref].supabase.co/storage/v1/object/public/[bucket]/[filename]
     project_ref = SUPABASE_URL.split("//")[1].split(".")[0]
-    base_storage_url = f"https://{project_ref}.supabase.co/storage/v1/object/public/resumes"
+    return f"https://{project_ref}.supabase.co/storage/v1/object/public/resumes"
 
+def plan_relink(candidates, base_storage_url):
+    # Only rows whose stored URL differs from the target need a write
+    changes, unchanged, missing = [], 0, []
     for c in candidates:
-        cid = c["id"]
         filename = c.get("local_filename")
-        
-        if filename:
-            public_url = f"{base_storage_url}/{filename}"
-            print(f"Linking ID {cid} -> {filename}")
-            try:
-                supabase.table("candidates").update({"resume_url": public_url}).eq("id", cid).execute()
-            except Exception as e:
-                print(f"Failed to update {cid}: {e}")
+        if not filename:
+            missing.append(c["id"])
+            continue
+        public_url = f"{base_storage_url}/{filename}"
+        if c.get("resume_url") == public_url:
+            unchanged += 1
         else:
-            print(f"ID {cid} has no filename, skipping.")
+            changes.append({"id": c["id"], "resume_url": public_url, "old_url": c.get("resume_url")})
+    return changes, unchanged, missing
+
+def verify_urls(urls, workers=VERIFY_WORKERS):
+    # Concurrent HEAD checks over one pooled session
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=workers)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    def head(url):
+        try:
+            return url, session.head(url, timeout=10).status_code
+        except Exception as e:
+            return url, f"error: {e}"
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(pool.map(head, urls))
+
+def update_urls(dry_run=False, verify=False, batch_size=BATCH_SIZE):
+    print("Fetching candidates from cloud...")
+    res = supabase.table("candidates").select("id, local_filename, resume_url").execute()
+    candidates = res.data
+
+    if not candidates:
+        print("No candidates found in Supabase.")
+        return
+
+    changes, unchanged, missing = plan_relink(candidates, storage_base_url())
+    print(f"{len(candidates)} candidates: {len(changes)} to relink, {unchanged} already linked, {len(missing)} without filename")
+    for change in changes[:20]:
+        print(f"  ID {change['id']}: {change['old_url'] or '(none)'} -> {change['resume_url']}")
+    if len(changes) > 20:
+        print(f"  ... and {len(changes) - 20} more")
+    if missing:
+        print(f"  No filename, skipped: {', '.join(str(cid) for cid in missing[:20])}{' ...' if len(missing) > 20 else ''}")
+
+    if verify and changes:
+        print(f"\nVerifying {len(changes)} target objects...")
+        statuses = verify_urls([c["resume_url"] for c in changes])
+        broken = {url: status for url, status in statuses.items() if status != 200}
+        print(f"{len(statuses) - len(broken)} reachable, {len(broken)} unreachable")
+        for url, status in list(broken.items())[:20]:
+            print(f"  {status}: {url}")
+
+    if dry_run:
+        print("\nDry run: no rows were written.")
+        return
+
+    # Bulk upsert of just (id, resume_url); other columns are left untouched
+    updated = 0
+    for i in range(0, len(changes), batch_size):
+        batch = [{"id": c["id"], "resume_url": c["resume_url"]} for c in changes[i:i + batch_size]]
+        try:
+            supabase.table("candidates").upsert(batch, on_conflict="id").execute()
+            updated += len(batch)
+        except Exception as e:
+            print(f"Failed to update batch starting at ID {batch[0]['id']}: {e}")
 
-    print("\nURL Linking Complete! Your intelligence matrix is now connected to the cloud files.")
+    print(f"\nURL Linking Complete! {updated} candidates relinked; your intelligence matrix is now connected to the cloud files.")
 
 if __name__ == "__main__":
-    update_urls()
+    parser = argparse.ArgumentParser(description="Point candidates.resume_url at the Supabase storage bucket")
+    parser.add_argument("--dry-run", action="store_true", help="report the planned changes without writing")
+    parser.add_argument("--verify", action="store_true", help="HEAD-check every target object before relinking")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="rows per bulk upsert")
+    args = parser.parse_args()
+    update_urls(dry_run=args.dry_run, verify=args.verify, batch_size=args.batch_size)
@@ -1,11 +1,22 @@
-import io
-import csv
-import pypdf
+import os
+import time
+import threading
 import re
-import json
-from collections import Counter
+import tempfile
 import classifier
-from supabase import create_client, Client
+import extraction
+import metrics
+from resume_cache import ResumeCache
+from table_cache import TTLCache
+from csv_ingest import CsvIngestor
+from job_queue import JobQueue, Worker
+from score_matrix import ScoreMatrix
+from term_matrix import TermMatrix
+from candidate_store import CandidateStore
+from change_log import ChangeLog
+from search_index import SearchIndex
+from keyword_index import KeywordIndex, tokenize, fingerprint
+from jd_profile import JDProfile, JDProfiles
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -14,189 +25,580 @@ load_dotenv()
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.abspath(os.path.join(BASE_DIR, ".."))
 CSV_PATH = os.path.join(DATA_DIR, "Recruitment.csv")
-CACHE_PATH = os.path.join(BASE_DIR, "metadata_cache.json")
+
+def _state_dir():
+    # Caches, indexes and the job queue. Serverless bundles (Vercel) are read-only, so those use the temp dir
+    path = os.getenv("STATE_DIR")
+    if not path:
+        writable = os.access(BASE_DIR, os.W_OK) and not os.getenv("VERCEL")
+        path = BASE_DIR if writable else os.path.join(tempfile.gettempdir(), "rommaana-state")
+    try:
+        os.makedirs(path, exist_ok=True)
+    except OSError as e:
+        print(f"State dir {path} unavailable: {e}")
+    return path
+
+STATE_DIR = _state_dir()
+CACHE_PATH = os.path.join(STATE_DIR, "metadata_cache.sqlite3")
+CACHE_MAX_BYTES = int(os.getenv("RESUME_CACHE_MAX_MB", "256")) * 1024 * 1024
+INDEX_PATH = os.path.join(STATE_DIR, "keyword_index.json")
+SEARCH_INDEX_PATH = os.path.join(STATE_DIR, "search_index.sqlite3")
+SCORE_MATRIX_PATH = os.path.join(STATE_DIR, "score_matrix.npz")
+# Seconds before a resume that failed to extract is tried again
+EXTRACT_RETRY_INTERVAL = 300
+JOB_QUEUE_PATH = os.path.join(STATE_DIR, "job_queue.sqlite3")
+# Background worker threads started by the API server; scripts keep extracting inline
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+TABLE_CACHE_TTL = float(os.getenv("TABLE_CACHE_TTL", "30"))
+TABLE_CACHE_MAX_ENTRIES = int(os.getenv("TABLE_CACHE_MAX_ENTRIES", "256"))
+
+# Content-addressed extracted text + classifier metadata
+resume_cache = ResumeCache(CACHE_PATH, max_bytes=CACHE_MAX_BYTES)
+
+# Persistent token -> candidate ids index used for bulk JD scoring
+keyword_index = KeywordIndex(INDEX_PATH)
+
+# Full-text index behind /api/search, synced alongside the keyword index
+search_index = SearchIndex(SEARCH_INDEX_PATH)
+
+# Compiled job descriptions (keywords, score table, skills), shared by every scoring path
+jd_profiles = JDProfiles()
+
+# Candidate x job scores derived from the index, refreshed incrementally
+score_matrix = ScoreMatrix(keyword_index, SCORE_MATRIX_PATH, jd_profiles)
+
+# Term-frequency matrix for BM25 / TF-IDF ranking, built on first use
+term_matrix = TermMatrix()
+
+# Version of the candidate list as served, for ETags and ?since= deltas
+changes = ChangeLog()
+
+# Read-through cache of Supabase selects, patched by the write endpoints
+table_cache = TTLCache(ttl=TABLE_CACHE_TTL, maxsize=TABLE_CACHE_MAX_ENTRIES)
+
+# Persistent queue of resume extraction ("extract") and index precompute ("score") jobs
+jobs = JobQueue(JOB_QUEUE_PATH, retry_failed_after=EXTRACT_RETRY_INTERVAL)
+# (kind, candidate id) -> when it was last handed to the queue, to skip redundant enqueues
+_enqueued = {}
+
+# Incremental reader for the append-only Wix export
+csv_ingestor = CsvIngestor(CSV_PATH)
+
+# Local candidates parsed so far (without text), kept between requests. The id is the CSV row
+# index; `sources` holds each row's resume path/URL and `keys` its resume cache key once known.
+_local = {"candidates": CandidateStore(), "sources": {}, "keys": {}, "retry_at": {}}
+_local_lock = threading.RLock()
+# Columnar copy of the cached Supabase candidate rows, rebuilt when those rows change
+_cloud = {"rows": None, "store": None, "synced": None}
 
 # Cloud Configuration
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
-supabase: Client = None
-if SUPABASE_URL and SUPABASE_KEY:
-    try:
-        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-    except Exception as e:
-        print(f"CRITICAL: Supabase init failed: {e}")
+# The client (and the supabase package itself) is only loaded on first use, so cold starts
+# for requests that never touch the database skip it entirely
+_UNSET = object()
+_supabase = _UNSET
+_supabase_lock = threading.Lock()
+
+def supabase_configured():
+    return bool(SUPABASE_URL and SUPABASE_KEY)
+
+def get_supabase():
+    global _supabase
+    if _supabase is _UNSET:
+        with _supabase_lock:
+            if _supabase is _UNSET:
+                client = None
+                if supabase_configured():
+                    try:
+                        from supabase import create_client
+                        client = create_client(SUPABASE_URL, SUPABASE_KEY)
+                    except Exception as e:
+                        print(f"CRITICAL: Supabase init failed: {e}")
+                _supabase = client
+    return _supabase
+
+def __getattr__(name):
+    # Keeps `utils.supabase` working for callers while deferring client creation
+    if name == "supabase":
+        return get_supabase()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def fetch_table(table, columns="*", eq=None):
+    # `eq` is an optional (column, value) filter for indexed point lookups
+    key = (table, columns, eq)
+    rows = table_cache.get(key)
+    if rows is None:
+        query = get_supabase().table(table).select(columns)
+        if eq:
+            query = query.eq(*eq)
+        metrics.outbound("supabase", "select")
+        with metrics.span("supabase_select"):
+            rows = query.execute().data or []
+        table_cache.set(key, rows)
+    return rows
+
+def patch_cached_rows(table, key_field, row, insert=True):
+    # Write-through: apply an upsert/update to every cached read of `table`
+    def apply(key, rows):
+        _, columns, eq = key
+        fields = row if columns == "*" else {k: v for k, v in row.items() if k in _split_columns(columns)}
+        found = any(r.get(key_field) == row[key_field] for r in rows)
+        patched = [dict(r, **fields) if r.get(key_field) == row[key_field] else r for r in rows]
+        # Filtered point lookups only ever hold their own row
+        if insert and not found and eq is None:
+            patched.append(dict(fields))
+        return patched
+    table_cache.update(lambda key: key[0] == table, apply)
 
-def load_cache():
-    if os.path.exists(CACHE_PATH):
+def _split_columns(columns):
+    return {c.strip() for c in columns.split(",")}
+
+def invalidate_table(table):
+    table_cache.invalidate(lambda key: key[0] == table)
+
+def get_candidate(candidate_id, columns=None):
+    """Point lookup of one candidate, optionally projected to `columns`.
+
+    Returns None when the id is unknown. Supabase is queried with an indexed
+    `.eq("id", ...)` select; the local CSV path answers from the in-memory
+    candidate list, reading resume text from the cache only if asked.
+    """
+    if get_supabase():
         try:
-            with open(CACHE_PATH, "r") as f:
-                return json.load(f)
-        except:
-            return {}
-    return {}
+            rows = fetch_table("candidates", ", ".join(columns) if columns else "*", eq=("id", candidate_id))
+            return dict(rows[0]) if rows else None
+        except Exception as e:
+            print(f"Cloud lookup failed: {e}. Falling back to local.")
 
-def save_cache(data):
-    with open(CACHE_PATH, "w") as f:
-        json.dump(data, f, indent=2)
+    store = refresh_local_candidates()
+    pos = store.position(candidate_id)
+    if pos is None:
+        return None
+    row = store.row(pos)
+    if not columns or "resume_text" in columns:
+        key = _local["keys"].get(candidate_id)
+        row["resume_text"] = (resume_cache.get_text(key) if key else None) or ""
+    if columns:
+        row = {col: row.get(col) for col in columns}
+    return row
 
-def load_candidates(force_local=False):
+def load_candidates(force_local=False, include_text=True):
     # Attempt to load from Cloud (Supabase) if configured
-    if supabase and not force_local:
+    if get_supabase() and not force_local:
+        try:
+            rows = fetch_table("candidates")
+            sync_cloud_candidates(rows)
+            # Copies, so per-request fields never leak into the cached rows
+            return [dict(row) for row in rows]
+        except Exception as e:
+            print(f"Cloud fetch failed: {e}. Falling back to local.")
+
+    candidates = refresh_local_candidates().rows()
+    if include_text:
+        keys = dict(_local["keys"])
+        texts = resume_cache.get_texts(set(keys.values()))
+        for c in candidates:
+            key = keys.get(c["id"])
+            c["resume_text"] = texts.get(key, "") if key else ""
+    return candidates
+
+def load_candidate_store(force_local=False):
+    """Candidates as a CandidateStore, without resume text (see load_resume_texts)."""
+    if get_supabase() and not force_local:
         try:
-            response = supabase.table("candidates").select("*").execute()
-            return response.data or []
+            rows = fetch_table("candidates")
+            sync_cloud_candidates(rows)
+            return cloud_candidate_store(rows)
         except Exception as e:
             print(f"Cloud fetch failed: {e}. Falling back to local.")
+    return refresh_local_candidates()
 
-    if not os.path.exists(CSV_PATH):
-        return []
+def cloud_candidate_store(rows):
+    # The table cache hands back the same list until it expires or a write patches it
+    with _local_lock:
+        if _cloud["rows"] is not rows:
+            _cloud.update(rows=rows, store=CandidateStore.from_rows(rows))
+        return _cloud["store"]
+
+def synced_cloud_store(rows):
+    # The store for `rows` if they are already synced, so idle polls need no worker thread
+    store = _cloud["store"]
+    return store if _cloud["synced"] is rows and _cloud["rows"] is rows else None
+
+def sync_cloud_candidates(candidates):
+    # `candidates` are the cached table rows: a new list only after the TTL expires or a write patches it,
+    # so while it is the same object there is nothing to re-hash, re-index or enqueue
+    with _local_lock:
+        if _cloud["synced"] is candidates:
+            return
+        _cloud["synced"] = candidates
+        _sync_search(
+            {row["id"]: _cloud_search_fingerprint(row) for row in candidates},
+            lambda ids: _cloud_search_documents(candidates, ids)
+        )
+    if not worker.running:
+        keyword_index.sync(candidates)
+        return
+    # Missing text is fetched and new text indexed by the worker, not by this request
+    enqueue_jobs("extract", {
+        c["id"]: {"source": c["resume_url"], "cloud": True, "classify": needs_classification(c)}
+        for c in candidates if c.get("resume_url") and not c.get("resume_text")
+    })
+    keyword_index.sync(candidates, defer=lambda ids: enqueue_jobs("score", dict.fromkeys(ids)))
+
+def candidate_from_row(index, row):
+    # precise column names:
+    # Submission time,First name,Last name,Email,Phone,Are you currently working?,Attach you Resume
+    
+    resume_url = row.get("Attach you Resume", "")
+    if not resume_url:
+        resume_url = ""
+        
+    local_filename = ""
+    if resume_url:
+        resume_url = resume_url.strip()
+        path_part = resume_url.split('?')[0]
+        parts = path_part.split('/')
+        if parts:
+            local_filename = parts[-1].strip()
+        
+        if local_filename and not local_filename.lower().endswith('.pdf'):
+            match = re.search(r'([a-zA-Z0-9_-]+\.pdf)', resume_url, re.IGNORECASE)
+            if match:
+                local_filename = match.group(1)
     
-    candidates = []
-    # Load cache
-    metadata_cache = load_cache()
-    auth_cache_updated = False
+    local_path = resolve_pdf_path(local_filename) if local_filename else None
+    candidate = {
+        "id": index,
+        "submission_time": row.get("Submission time", ""),
+        "first_name": row.get("First name", ""),
+        "last_name": row.get("Last name", ""),
+        "email": row.get("Email", ""),
+        "phone": row.get("Phone", ""),
+        "working_status": row.get("Are you currently working?", ""),
+        "resume_url": resume_url,
+        "local_filename": local_filename,
+        "role": "Unclassified",
+        "skills": [],
+        "locations": [],
+        "languages": [],
+        "resume_text": ""
+    }
+    return candidate, local_path or resume_url
+
+def refresh_local_candidates():
+    """Bring the in-memory candidate list up to date with Recruitment.csv.
+
+    Only rows appended since the last call are parsed; the list is rebuilt
+    from scratch only when the file was rewritten. Rows whose resume is not
+    in the resume cache yet are looked up here, and extracted either by the
+    background worker (when running) or inline. Returns the shared
+    CandidateStore, which callers must not mutate.
+    """
+    with _local_lock:
+        try:
+            with metrics.span("csv_ingest"):
+                rows, first_new, rebuilt = csv_ingestor.read()
+        except Exception as e:
+            print(f"Error reading CSV: {e}")
+            return _local["candidates"]
+        if rebuilt:
+            _local.update(candidates=CandidateStore(), sources={}, keys={}, retry_at={})
+        changed = rebuilt
+        evicted = resume_cache.pop_evicted()
+        if evicted:
+            # Their text is gone from the cache; forgetting the key gets them extracted again below
+            for cid in [cid for cid, key in _local["keys"].items() if key in evicted]:
+                del _local["keys"][cid]
+                _local["retry_at"].pop(cid, None)
+        for index in range(first_new, len(rows)):
+            candidate, source = candidate_from_row(index, rows[index])
+            _local["candidates"].append(candidate)
+            if source:
+                _local["sources"][index] = source
+            changed = True
 
+        # New rows, plus earlier extraction failures that are due for a retry
+        now = time.monotonic()
+        unresolved = {
+            cid: src for cid, src in _local["sources"].items()
+            if cid not in _local["keys"] and _local["retry_at"].get(cid, 0) <= now
+        }
+        if unresolved:
+            # Cache is keyed by content, so row order in the CSV never matters
+            cached = resume_cache.lookup(set(unresolved.values()))
+            pending = {cid: src for cid, src in unresolved.items() if src not in cached}
+            if pending and worker.running:
+                enqueue_jobs("extract", {cid: {"source": src} for cid, src in pending.items()})
+            elif pending:
+                cached.update(extract_into_cache(set(pending.values())))
+            for cid, src in unresolved.items():
+                metadata = cached.get(src)
+                if not metadata:
+                    # Queued or failed; either way not worth another look before the retry interval
+                    _local["retry_at"][cid] = now + EXTRACT_RETRY_INTERVAL
+                    continue
+                _apply_local_metadata(cid, metadata)
+                changed = True
+
+        if changed:
+            # Content keys double as index fingerprints, so this never needs the text of unchanged resumes
+            keys = _local["keys"]
+            keyword_index.sync(
+                [{"id": cid} for cid in keys], fingerprints=keys, load_text=lambda cid: resume_cache.get_text(keys[cid]),
+                defer=_defer_scoring()
+            )
+            # Rows without a resume yet are still searchable by name
+            _sync_search(
+                {cid: keys.get(cid) or "" for cid in _local["candidates"].ids},
+                lambda ids: search_documents(ids, force_local=True)
+            )
+        return _local["candidates"]
+
+def _defer_scoring():
+    # With workers running, (re)indexing happens in "score" jobs instead of the request
+    return (lambda ids: enqueue_jobs("score", dict.fromkeys(ids))) if worker.running else None
+
+def _sync_search(fingerprints, load_docs):
+    # The search index is derived data; a broken one (read-only disk, locked database) must not fail a candidate load
     try:
-        with open(CSV_PATH, mode='r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            for index, row in enumerate(reader):
-                # precise column names:
-                # Submission time,First name,Last name,Email,Phone,Are you currently working?,Attach you Resume
-                
-                resume_url = row.get("Attach you Resume", "")
-                if not resume_url:
-                    resume_url = ""
-                    
-                local_filename = ""
-                if resume_url:
-                    resume_url = resume_url.strip()
-                    path_part = resume_url.split('?')[0]
-                    parts = path_part.split('/')
-                    if parts:
-                        local_filename = parts[-1].strip()
-                    
-                    if local_filename and not local_filename.lower().endswith('.pdf'):
-                        match = re.search(r'([a-zA-Z0-9_-]+\.pdf)', resume_url, re.IGNORECASE)
-                        if match:
-                            local_filename = match.group(1)
-                
-                # Check cache for metadata
-                cid = str(index)
-                metadata = metadata_cache.get(cid, {})
-                
-                if (not metadata or "text" not in metadata):
-                    extraction_source = local_filename if (local_filename and os.path.exists(os.path.join(DATA_DIR, local_filename))) else resume_url
-                    
-                    if extraction_source:
-                        text = get_pdf_text(extraction_source)
-                        if text:
-                            role = classifier.classify_role(text)
-                            meta_entities = classifier.extract_metadata(text)
-                            metadata = {
-                                "role": role,
-                                "skills": meta_entities["skills"],
-                                "locations": meta_entities["locations"],
-                                "languages": meta_entities["languages"],
-                                "text": text
-                            }
-                            metadata_cache[cid] = metadata
-                            auth_cache_updated = True
-                        else:
-                            metadata = {"role": "Unclassified", "skills": [], "locations": [], "languages": []}
-                    else:
-                        metadata = {"role": "Unclassified", "skills": [], "locations": [], "languages": []}
-
-                candidates.append({
-                    "id": index,
-                    "submission_time": row.get("Submission time", ""),
-                    "first_name": row.get("First name", ""),
-                    "last_name": row.get("Last name", ""),
-                    "email": row.get("Email", ""),
-                    "phone": row.get("Phone", ""),
-                    "working_status": row.get("Are you currently working?", ""),
-                    "resume_url": resume_url,
-                    "local_filename": local_filename,
-                    "role": metadata.get("role", "Unclassified"),
-                    "skills": metadata.get("skills", []),
-                    "locations": metadata.get("locations", []),
-                    "languages": metadata.get("languages", []),
-                    "resume_text": metadata.get("text", "")
-                })
+        search_index.sync(fingerprints, load_docs, defer=_defer_scoring())
     except Exception as e:
-        print(f"Error reading CSV: {e}")
-        return []
+        print(f"Search index sync failed: {e}")
 
-    if auth_cache_updated:
-        save_cache(metadata_cache)
-        
-    return candidates
+def _index_search_documents(docs):
+    try:
+        search_index.add_many(docs)
+    except Exception as e:
+        print(f"Search index update failed: {e}")
+
+def _search_document(candidate, text):
+    return {
+        "name": f"{candidate.get('first_name') or ''} {candidate.get('last_name') or ''}".strip(),
+        "skills": " ".join(candidate.get("skills") or []),
+        "locations": " ".join(candidate.get("locations") or []),
+        "text": text or ""
+    }
+
+def _cloud_search_fingerprint(row):
+    return fingerprint("\x1f".join([
+        row.get("first_name") or "", row.get("last_name") or "", " ".join(row.get("skills") or []), row.get("resume_text") or ""
+    ]))
+
+def _cloud_search_documents(rows, candidate_ids):
+    wanted = set(candidate_ids)
+    return {
+        row["id"]: (_cloud_search_fingerprint(row), _search_document(row, row.get("resume_text")))
+        for row in rows if row["id"] in wanted
+    }
+
+def search_documents(candidate_ids, force_local=False):
+    """{id: (fingerprint, document)} for the full-text index."""
+    if get_supabase() and not force_local:
+        try:
+            return _cloud_search_documents(fetch_table("candidates"), candidate_ids)
+        except Exception as e:
+            print(f"Cloud fetch failed: {e}. Falling back to local.")
+    store = _local["candidates"]
+    keys = dict(_local["keys"])
+    wanted = [cid for cid in candidate_ids if store.position(cid) is not None]
+    texts = resume_cache.get_texts({keys[cid] for cid in wanted if cid in keys})
+    return {
+        cid: (keys.get(cid) or "", _search_document(store.row(store.position(cid)), texts.get(keys.get(cid))))
+        for cid in wanted
+    }
+
+def index_resume_text(candidate_id, text):
+    # For text backfilled outside the resume cache (inline extraction in the resume endpoint)
+    docs = search_documents([candidate_id])
+    if candidate_id in docs:
+        fp, document = docs[candidate_id]
+        document["text"] = text
+        _index_search_documents({candidate_id: (fp, document)})
+
+def _apply_local_metadata(cid, metadata):
+    store = _local["candidates"]
+    store.update(
+        store.position(cid),
+        role=metadata["role"],
+        skills=metadata["skills"],
+        locations=metadata["locations"],
+        languages=metadata["languages"]
+    )
+    _local["keys"][cid] = metadata["key"]
+    _local["retry_at"].pop(cid, None)
+
+# --- Background jobs ---
+
+def enqueue_jobs(kind, payloads):
+    # payloads: {candidate_id: payload}; ids handed over recently are skipped without touching the queue
+    now = time.monotonic()
+    fresh = {
+        cid: payload for cid, payload in payloads.items()
+        if now - _enqueued.get((kind, cid), -EXTRACT_RETRY_INTERVAL) >= EXTRACT_RETRY_INTERVAL
+    }
+    if not fresh:
+        return
+    for cid in fresh:
+        _enqueued[(kind, cid)] = now
+    if jobs.enqueue_many(kind, fresh):
+        worker.notify()
+
+def needs_classification(candidate):
+    return not candidate.get("role") or candidate.get("role") == "Unclassified"
+
+def request_extraction(candidate):
+    """Queue one candidate's resume for extraction and return its job status."""
+    cid = candidate["id"]
+    if get_supabase():
+        payload = {"source": candidate["resume_url"], "cloud": True, "classify": needs_classification(candidate)}
+    else:
+        payload = {"source": _local["sources"].get(cid) or candidate["resume_url"]}
+    _enqueued.pop(("extract", cid), None)
+    enqueue_jobs("extract", {cid: payload})
+    return jobs.get("extract", cid)
+
+@metrics.timed("extract_job")
+def run_extract_job(candidate_id, payload):
+    # Download/parse/classify one resume into the resume cache, then hand its text to the index
+    source = payload["source"]
+    metadata = resume_cache.lookup([source]).get(source)
+    if metadata is None:
+        text, digest = extraction.extract_source(source)
+        metadata = {"key": digest, **build_metadata(text)}
+        resume_cache.put(source, digest, metadata)
 
+    if payload.get("cloud"):
+        text = metadata.get("text") or resume_cache.get_text(metadata["key"]) or ""
+        row = {"resume_text": text}
+        if payload.get("classify"):
+            row.update(role=metadata["role"], skills=metadata["skills"])
+        metrics.outbound("supabase", "update")
+        get_supabase().table("candidates").update(row).eq("id", candidate_id).execute()
+        patch_cached_rows("candidates", "id", {"id": candidate_id, **row}, insert=False)
+    else:
+        with _local_lock:
+            # The CSV may have been rewritten since the job was queued
+            if _local["sources"].get(candidate_id) != source:
+                return
+            _apply_local_metadata(candidate_id, metadata)
+    _enqueued.pop(("extract", candidate_id), None)
+    _enqueued.pop(("score", candidate_id), None)
+    enqueue_jobs("score", {candidate_id: None})
+
+def run_score_job(candidate_id, payload):
+    # Tokenize one resume into the keyword index that every scoring path reads, and refresh its search entry
+    if get_supabase():
+        # The one cached table read, not a per-candidate lookup that would churn the table cache
+        rows = fetch_table("candidates")
+        pos = cloud_candidate_store(rows).position(candidate_id)
+        row = rows[pos] if pos is not None else None
+        text = row.get("resume_text") if row else None
+        key = fingerprint(text) if text else None
+        docs = _cloud_search_documents([row], [candidate_id]) if row else {}
+    else:
+        key = _local["keys"].get(candidate_id)
+        text = resume_cache.get_text(key) if key else None
+        docs = search_documents([candidate_id], force_local=True)
+    if text:
+        keyword_index.add(candidate_id, text, key)
+    _index_search_documents(docs)
+    _enqueued.pop(("score", candidate_id), None)
+
+def load_resume_texts(candidate_ids):
+    # {id: resume text} for indexed candidates, from the cached Supabase rows or the resume cache
+    wanted = set(candidate_ids)
+    if get_supabase():
+        try:
+            return {row["id"]: row.get("resume_text") for row in fetch_table("candidates") if row["id"] in wanted}
+        except Exception as e:
+            print(f"Cloud fetch failed: {e}. Falling back to local.")
+    keys = {cid: _local["keys"][cid] for cid in wanted if cid in _local["keys"]}
+    texts = resume_cache.get_texts(set(keys.values()))
+    return {cid: texts.get(key) for cid, key in keys.items()}
+
+def refresh_term_matrix():
+    # Follows the keyword index, so only resumes it (re)indexed are re-tokenized
+    _, fingerprints = keyword_index.fingerprints()
+    term_matrix.refresh(fingerprints, load_resume_texts)
+
+@metrics.timed("classify")
+def build_metadata(text):
+    # One vocabulary scan shared by role classification and entity extraction
+    hits = classifier.scan(text)
+    meta_entities = classifier.extract_metadata(text, hits)
+    return {
+        "role": classifier.classify_role(text, hits),
+        "skills": meta_entities["skills"],
+        "locations": meta_entities["locations"],
+        "languages": meta_entities["languages"],
+        "text": text
+    }
+
+def extract_into_cache(sources):
+    # Runs the concurrent extraction stage; each file is written to the cache as it finishes
+    extracted = {}
+
+    def on_result(source, text, digest):
+        metadata = build_metadata(text)
+        resume_cache.put(source, digest, metadata)
+        extracted[source] = {"key": digest, **metadata}
+
+    extraction.extract_texts({src: src for src in sources}, on_result)
+    return extracted
+
+def resolve_pdf_path(filename):
+    file_path = os.path.join(DATA_DIR, filename)
+    if os.path.isfile(file_path):
+        return file_path
+    # Fallback to backend dir
+    alt_path = os.path.join(BASE_DIR, filename)
+    if os.path.isfile(alt_path):
+        return alt_path
+    return None
+
+@metrics.timed("get_pdf_text")
 def get_pdf_text(filename_or_url):
     # If it looks like a URL, fetch it
     if filename_or_url.startswith("http"):
         try:
-            import requests
-            response = requests.get(filename_or_url)
-            response.raise_for_status()
-            f = io.BytesIO(response.content)
-            reader = pypdf.PdfReader(f)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            return text
+            return extraction.extract_source(filename_or_url)[0]
         except Exception as e:
             print(f"Error fetching remote PDF {filename_or_url}: {e}")
             return ""
 
-    file_path = os.path.join(DATA_DIR, filename_or_url)
-    if not os.path.exists(file_path):
-        # Fallback to backend dir
-        backend_dir = os.path.dirname(os.path.abspath(__file__))
-        alt_path = os.path.join(backend_dir, filename_or_url)
-        if os.path.exists(alt_path):
-            file_path = alt_path
-        else:
-            return ""
+    file_path = resolve_pdf_path(filename_or_url)
+    if not file_path:
+        return ""
     
     try:
-        reader = pypdf.PdfReader(file_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        return text
+        return extraction.pdf_file_to_text(file_path)
     except Exception as e:
         print(f"Error reading {filename_or_url}: {e}")
         return ""
 
+@metrics.timed("score_candidate")
 def score_candidate(resume_text, job_description):
+    # job_description may also be an already compiled JDProfile
     if not resume_text or not job_description:
         return 0, []
     
-    # Normalize text
-    def clean_text(text):
-        return re.sub(r'[^a-zA-Z0-9\s]', '', text.lower())
-
-    resume_words = set(clean_text(resume_text).split())
-    jd_words = clean_text(job_description).split()
-    
-    # Filter stopwords (basic list to avoid zero-info matches)
-    stopwords = {"and", "the", "of", "in", "to", "a", "is", "for", "with", "on", "at", "by", "an", "be", "this", "that", "it", "are", "from", "or", "as", "if", "but", "not"}
-    important_keywords = [w for w in jd_words if w not in stopwords and len(w) > 2]
-    
-    matched_keywords = []
-    score = 0
+    profile = job_description if isinstance(job_description, JDProfile) else jd_profiles.for_text(job_description)
+    resume_words = tokenize(resume_text)
     
     # Simple scoring: +1 for each unique keyword found
     # We could do frequency based, but presence is usually a good first filter
-    unique_jd_keywords = set(important_keywords)
-    for kw in unique_jd_keywords:
-        if kw in resume_words:
-            score += 1
-            matched_keywords.append(kw)
-            
-    # Calculate percentage
-    max_score = len(unique_jd_keywords)
-    final_score = (score / max_score * 100) if max_score > 0 else 0
-    
-    return round(final_score, 1), matched_keywords
+    matched_keywords = [kw for kw in profile.keywords if kw in resume_words]
+    return profile.percent(len(matched_keywords)), matched_keywords
+
+worker = Worker(jobs, {"extract": run_extract_job, "score": run_score_job}, threads=JOB_WORKERS, on_idle=keyword_index.save)
+
+metrics.register_cache("table", table_cache)
+metrics.register_cache("jd_profile", jd_profiles)
+metrics.register_cache("resume", resume_cache)
+metrics.register_collector(lambda: [
+    ("rommaana_jobs", {"kind": kind, "status": status}, n)
+    for kind, statuses in jobs.counts().items() for status, n in statuses.items()
+])